@@ -90,16 +90,17 @@ def axang2quat(axis, angle):
 
 
 def multiply_quaternions(q1, q2):
-    """Find the product of two quaternions.
+    """Find the product of two quaternions, or of two (broadcastable) arrays of
+    quaternions.
 
     Parameters
     ----------
-    q1 : ndarray of shape (4,)
-    q2 : ndarray of shape (4,)
+    q1 : ndarray of shape (..., 4)
+    q2 : ndarray of shape (..., 4)
 
     Returns
     -------
-    q3 : ndarray of shape (4,)
+    q3 : ndarray of shape (..., 4)
 
     References
     ----------
@@ -108,11 +109,14 @@ def multiply_quaternions(q1, q2):
 
     """
 
-    s1, v1 = q1[0], q1[1:]
-    s2, v2 = q2[0], q2[1:]
+    q1 = np.asarray(q1, dtype=float)
+    q2 = np.asarray(q2, dtype=float)
 
-    q3 = np.zeros(4)
-    q3[0] = (s1 * s2) - np.dot(v1, v2)
-    q3[1:] = (s1 * v2) + (s2 * v1) + np.cross(v1, v2)
+    s1, v1 = q1[..., 0], q1[..., 1:]
+    s2, v2 = q2[..., 0], q2[..., 1:]
+
+    q3 = np.empty(np.broadcast_shapes(q1.shape, q2.shape))
+    q3[..., 0] = (s1 * s2) - np.einsum('...i,...i->...', v1, v2)
+    q3[..., 1:] = (s1[..., None] * v2) + (s2[..., None] * v1) + np.cross(v1, v2)
 
     return q3
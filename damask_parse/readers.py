@@ -1,61 +1,97 @@
 """`damask_parse.readers.py`"""
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-
+import asyncio
+import glob
+import io
+import json
+import os
+import time
+import traceback
+import warnings
+
+import h5py
 import pandas
 import re
 import numpy as np
 from ruamel.yaml import YAML
 
 from damask_parse.utils import (
+    GrowableArray,
+    get_element_material_idx_dtype,
     get_header_lines,
     get_num_header_lines,
-    get_HDF5_incremental_quantity,
+    HDF5ResultReader,
+    get_label_codes,
+    get_material_sidecar_path,
+    add_HDF5_operations_manifest,
+    get_HDF5_operation_key,
+    get_HDF5_operations_manifest,
     validate_volume_element,
     validate_element_material_idx,
+    YAML_PLAIN_STR_PAT,
+    YAML_RESERVED_STRS,
 )
+from damask_parse.writers import write_spectral_results
 from damask_parse.legacy.readers import parse_microstructure, parse_texture_gauss
 
 __all__ = [
     'read_geom',
     'read_spectral_stdout',
     'read_spectral_stderr',
+    'SpectralStdoutMonitor',
+    'read_spectral_files',
     'read_HDF5_file',
+    'read_HDF5_files',
+    'read_volume_element_response',
     'read_material',
     'geom_to_volume_element',
 ]
 
 
-def parse_increment_iteration(inc_iter_str):
+FLOAT_PAT = r'-?\d+\.\d+'
+SCI_FLOAT_PAT = r'-?\d+\.\d+E[+|-]\d+'
 
-    float_pat = r'-?\d+\.\d+'
-    sci_float_pat = r'-?\d+\.\d+E[+|-]\d+'
+INC_ITER_DG_PAT = re.compile(
+    r'deformation gradient aim\s+=\n(\s+(?:(?:' + FLOAT_PAT + r'\s+){3}){3})'
+)
+INC_ITER_PK_PAT = re.compile(
+    r'Piola--Kirchhoff stress\s+\/\s.*=\n(\s+(?:(?:' + FLOAT_PAT + r'\s+){3}){3})'
+)
+INC_ITER_ERR_PAT = re.compile(
+    r'error ([^=\n]*?)\s+=\s+(-?\d+\.\d+)\s\((' + SCI_FLOAT_PAT + r')\s(.*),\s+tol\s+=\s+(' +
+    SCI_FLOAT_PAT + r')\)'
+)
 
-    dg_pat = r'deformation gradient aim\s+=\n(\s+(?:(?:' + float_pat + r'\s+){3}){3})'
-    dg_match = re.search(dg_pat, inc_iter_str)
-    dg_str = dg_match.group(1)
-    dg = np.array([float(i) for i in dg_str.split()]).reshape((3, 3))
+INC_WARNING_PAT = re.compile(
+    r'│\s+warning\s+│\s+│\s+(\d+)\s+│\s+├─+┤\s+│(.*)│\s+\s+│(.*)│'
+)
+INC_CONVERGED_PAT = re.compile(r'increment\s\d+\sconverged')
+INC_POSITION_PAT = re.compile(
+    r'Time\s+(\d+\.\d+E[+|-]\d+)s:\s+Increment\s+(\d+\/\d+)-(\d+\/\d+)\s+of\sload\s'
+    r'case\s+(\d+)'
+)
+INC_ITER_SPLIT_PAT = re.compile(r'={75}')
 
-    pk_pat = r'Piola--Kirchhoff stress\s+\/\s.*=\n(\s+(?:(?:' + \
-        float_pat + r'\s+){3}){3})'
-    pk_match = re.search(pk_pat, inc_iter_str)
-    pk_str = pk_match.group(1)
-    pk = np.array([float(i) for i in pk_str.split()]).reshape((3, 3))
 
-    err_pat = r'error (.*)\s+=\s+(-?\d+\.\d+)\s\((' + sci_float_pat + \
-        r')\s(.*),\s+tol\s+=\s+(' + sci_float_pat + r')\)'
-    err_matches = re.findall(err_pat, inc_iter_str)
+def parse_increment_iteration(inc_iter_str):
+
+    dg_str = INC_ITER_DG_PAT.search(inc_iter_str).group(1)
+    dg = np.array(dg_str.split(), dtype=float).reshape((3, 3))
+
+    pk_str = INC_ITER_PK_PAT.search(inc_iter_str).group(1)
+    pk = np.array(pk_str.split(), dtype=float).reshape((3, 3))
+
     converge_err = {}
-    for i in err_matches:
+    for i in INC_ITER_ERR_PAT.findall(inc_iter_str):
         err_key = 'error_' + i[0].strip().replace(' ', '_')
-        converge_err.update({
-            err_key: {
-                'value': float(i[2]),
-                'unit': i[3].strip(),
-                'tol': float(i[4]),
-                'relative': float(i[1]),
-            }
-        })
+        converge_err[err_key] = {
+            'value': float(i[2]),
+            'unit': i[3].strip(),
+            'tol': float(i[4]),
+            'relative': float(i[1]),
+        }
 
     inc_iter = {
         'deformation_gradient_aim': dg,
@@ -68,8 +104,7 @@ def parse_increment_iteration(inc_iter_str):
 
 def parse_increment(inc_str):
 
-    warn_msg = r'│\s+warning\s+│\s+│\s+(\d+)\s+│\s+├─+┤\s+│(.*)│\s+\s+│(.*)│'
-    warnings_matches = re.findall(warn_msg, inc_str)
+    warnings_matches = INC_WARNING_PAT.findall(inc_str)
     warnings = [
         {
             'code': int(i[0]),
@@ -77,16 +112,14 @@ def parse_increment(inc_str):
         } for i in warnings_matches
     ]
 
-    if not re.search(r'increment\s\d+\sconverged', inc_str):
+    if not INC_CONVERGED_PAT.search(inc_str):
         parsed_inc = {
             'converged': False,
             'warnings': warnings,
         }
         return parsed_inc
 
-    inc_position_pat = (r'Time\s+(\d+\.\d+E[+|-]\d+)s:\s+Increment'
-                        r'\s+(\d+\/\d+)-(\d+\/\d+)\s+of\sload\scase\s+(\d+)')
-    inc_pos = re.search(inc_position_pat, inc_str)
+    inc_pos = INC_POSITION_PAT.search(inc_str)
     inc_pos_dat = inc_pos.groups()
 
     inc_time = float(inc_pos_dat[0])
@@ -94,8 +127,7 @@ def parse_increment(inc_str):
     inc_cut_back = 1 / int(inc_pos_dat[2].split('/')[1])
     inc_load_case = int(inc_pos_dat[3])
 
-    inc_iter_split_str = r'={75}'
-    inc_iter_split = re.split(inc_iter_split_str, inc_str)
+    inc_iter_split = INC_ITER_SPLIT_PAT.split(inc_str)
 
     dg_arr = []
     pk_arr = []
@@ -142,13 +174,237 @@ def parse_increment(inc_str):
     return parsed_inc
 
 
-def read_geom(geom_path):
+def decode_geom_voxels(voxels_lines, num_elems):
+    """Decode voxel lines of a DAMASK geometry file that may use compressed syntax.
+
+    Parameters
+    ----------
+    voxels_lines : iterable of str
+        Lines of the geometry file that follow the header lines. As well as plain
+        whitespace-delimited integers, lines of the form "N of M" (N repetitions of the
+        material index M) and "a to b" (the material indices from a to b inclusive, in
+        increasing or decreasing order) are understood, as generated by `geom_pack`.
+    num_elems : int
+        Total number of voxels expected in the file.
+
+    Returns
+    -------
+    element_material_idx : ndarray of shape (num_elems,) of int
+        One-indexed material index for each voxel, as written in the file.
+
+    """
+
+    element_material_idx = np.empty(num_elems, dtype=np.int32)
+    elem_idx = 0
+    for ln in voxels_lines:
+        items = ln.split('#')[0].split()
+        if not items:
+            continue
+        if len(items) == 3 and items[1].lower() == 'of':
+            values = int(items[2])
+            num_values = int(items[0])
+        elif len(items) == 3 and items[1].lower() == 'to':
+            start, stop = int(items[0]), int(items[2])
+            step = 1 if stop >= start else -1
+            values = np.arange(start, stop + step, step)
+            num_values = values.size
+        else:
+            values = [int(i) for i in items]
+            num_values = len(values)
+
+        if elem_idx + num_values > num_elems:
+            msg = (f'More material indices found in the geometry file than expected '
+                   f'({num_elems}).')
+            raise ValueError(msg)
+        element_material_idx[elem_idx:elem_idx + num_values] = values
+        elem_idx += num_values
+
+    if elem_idx != num_elems:
+        msg = (f'Found {elem_idx} material indices in the geometry file, but expected '
+               f'{num_elems}.')
+        raise ValueError(msg)
+
+    return element_material_idx
+
+
+def parse_geom_voxels(voxels_str, grid_size):
+    """Parse the voxel block of a DAMASK geometry file into a material index array.
+
+    Parameters
+    ----------
+    voxels_str : str
+        The part of the geometry file that follows the header lines.
+    grid_size : list of int of length 3
+        Resolution of volume element discretisation in each direction.
+
+    Returns
+    -------
+    element_material_idx : ndarray of shape equal to `grid_size` of int
+        One-indexed material index for each voxel, as written in the file.
+
+    Notes
+    -----
+    Plain (uncompressed) voxel data is parsed in bulk. If this fails, the voxel data is
+    decoded line-by-line with `decode_geom_voxels`, which also supports the compressed
+    "N of M" and "a to b" syntax.
+
+    """
+
+    num_elems = int(np.prod(grid_size))
+    try:
+        element_material_idx = np.fromstring(voxels_str, dtype=np.int32, sep=' ')
+    except ValueError:
+        element_material_idx = None
+
+    if element_material_idx is None or element_material_idx.size != num_elems:
+        element_material_idx = decode_geom_voxels(io.StringIO(voxels_str), num_elems)
+
+    element_material_idx = element_material_idx.reshape(grid_size[::-1])
+    element_material_idx = element_material_idx.swapaxes(0, 2)
+
+    return element_material_idx
+
+
+def encode_cache_data(data):
+    """Recursively convert ndarrays into a JSON-compatible form."""
+    if isinstance(data, np.ndarray):
+        return {'__ndarray__': data.tolist(), 'dtype': data.dtype.str}
+    elif isinstance(data, dict):
+        return {k: encode_cache_data(v) for k, v in data.items()}
+    elif isinstance(data, (list, tuple)):
+        return [encode_cache_data(i) for i in data]
+    elif isinstance(data, np.generic):
+        return data.item()
+    return data
+
+
+def decode_cache_data(data):
+    """Recursively restore ndarrays encoded by `encode_cache_data`."""
+    if isinstance(data, dict):
+        if '__ndarray__' in data:
+            return np.array(data['__ndarray__'], dtype=data['dtype'])
+        return {k: decode_cache_data(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [decode_cache_data(i) for i in data]
+    return data
+
+
+def get_geom_cache_dir(geom_path):
+    """Get the directory in which the parsed data of a geometry file is cached."""
+    geom_path = Path(geom_path)
+    return geom_path.with_name(geom_path.name + '.cache')
+
+
+GEOM_CACHE_VERSION = 2
+
+
+def get_geom_cache_key(geom_path, dtype=None):
+    """Get the identifying properties of a geometry file (and of the options with which
+    it is parsed) that invalidate its cache."""
+    geom_path = Path(geom_path).resolve()
+    stat = geom_path.stat()
+    return {
+        'version': GEOM_CACHE_VERSION,
+        'path': str(geom_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'dtype': None if dtype is None else np.dtype(dtype).str,
+    }
+
+
+def read_geom_cache(geom_path, dtype=None):
+    """Load the cached parsed data of a geometry file, if the cache is valid.
+
+    Parameters
+    ----------
+    geom_path : str or Path
+        Path to the DAMASK geometry file.
+    dtype : dtype-like, optional
+        The `element_material_idx` dtype option passed to `read_geom`.
+
+    Returns
+    -------
+    geometry : dict or NoneType
+        The geometry dict, as returned by `read_geom`, where `element_material_idx` is a
+        read-only memory-mapped array. None is returned if there is no cache, or if the
+        geometry file has changed since the cache was written.
+
+    """
+
+    cache_dir = get_geom_cache_dir(geom_path)
+    meta_path = cache_dir.joinpath('geometry.json')
+    elem_mat_idx_path = cache_dir.joinpath('element_material_idx.npy')
+
+    if not meta_path.is_file() or not elem_mat_idx_path.is_file():
+        return None
+
+    with meta_path.open('r') as handle:
+        try:
+            cache_meta = json.load(handle)
+        except ValueError:
+            return None
+    if cache_meta.get('source') != get_geom_cache_key(geom_path, dtype):
+        return None
+
+    geometry = decode_cache_data(cache_meta['geometry'])
+    geometry['element_material_idx'] = np.load(elem_mat_idx_path, mmap_mode='r')
+
+    return geometry
+
+
+def write_geom_cache(geom_path, geometry, dtype=None):
+    """Cache the parsed data of a geometry file in a directory alongside the file.
+
+    Parameters
+    ----------
+    geom_path : str or Path
+        Path to the DAMASK geometry file.
+    geometry : dict
+        The geometry dict, as returned by `read_geom`.
+    dtype : dtype-like, optional
+        The `element_material_idx` dtype option passed to `read_geom`.
+
+    """
+
+    cache_dir = get_geom_cache_dir(geom_path)
+    cache_dir.mkdir(exist_ok=True)
+    meta_path = cache_dir.joinpath('geometry.json')
+    elem_mat_idx_path = cache_dir.joinpath('element_material_idx.npy')
+
+    # Remove the metadata first, so an interrupted write does not leave a valid cache:
+    if meta_path.is_file():
+        meta_path.unlink()
+
+    np.save(elem_mat_idx_path, geometry['element_material_idx'])
+
+    cache_meta = {
+        'source': get_geom_cache_key(geom_path, dtype),
+        'geometry': encode_cache_data({
+            k: v for k, v in geometry.items() if k != 'element_material_idx'
+        }),
+    }
+    with meta_path.open('w') as handle:
+        json.dump(cache_meta, handle)
+
+
+def read_geom(geom_path, cache=False, dtype=None):
     """Parse a DAMASK geometry file into a volume element.
 
     Parameters
     ----------
     geom_path : str or Path
         Path to the DAMASK geometry file.
+    cache : bool, optional
+        If True, the parsed data is cached in a directory alongside the geometry file
+        (named by appending ".cache" to the file name), and subsequent calls load the
+        data from this cache, as long as the geometry file has not been modified (and
+        `dtype` is unchanged). In this case, `element_material_idx` is returned as a
+        read-only memory-mapped array. By default, False.
+    dtype : dtype-like, optional
+        Integer dtype of `element_material_idx`. By default, the smallest signed integer
+        dtype that can store the material indices is used (see
+        `utils.get_element_material_idx_dtype`). Specify `np.int64` to always use 64-bit
+        integers.
 
     Returns
     -------
@@ -156,6 +412,10 @@ def read_geom(geom_path):
         Dictionary of the parsed data from the geometry file, with keys:
             element_material_idx : ndarray of shape equal to `grid_size` of int
                 A mapping that determines the grain index for each voxel.
+            material_num_elements : 1D ndarray of int
+                Number of voxels of each material, from which, for instance, the volume
+                fraction of each material can be computed without another pass over
+                `element_material_idx`.
             grid_size : ndarray of int of size 3
                 Resolution of volume element discretisation in each direction.
             size : list of length 3
@@ -184,175 +444,381 @@ def read_geom(geom_path):
 
     """
 
+    if cache:
+        geometry = read_geom_cache(geom_path, dtype)
+        if geometry is not None:
+            return geometry
+
     num_header = get_num_header_lines(geom_path)
 
     with Path(geom_path).open('r') as handle:
-
-        lines = handle.read()
-
-        grid_size = None
-        grid_pat = r'grid\s+a\s+(\d+)\s+b\s+(\d+)\s+c\s+(\d+)'
-        grid_match = re.search(grid_pat, lines)
-        if grid_match:
-            grid_size = [int(i) for i in grid_match.groups()]
-        else:
-            raise ValueError('`grid` not specified in file.')
-
-        element_material_idx = []
-        for ln_idx, ln in enumerate(lines.splitlines()):
-            ln_split = ln.strip().split()
-            if ln_idx > num_header:
-                element_material_idx.extend([int(i) for i in ln_split])
-
-        element_material_idx = np.array(element_material_idx).reshape(grid_size[::-1])
-        element_material_idx = element_material_idx.swapaxes(0, 2)
-        element_material_idx -= 1  # zero-indexed
-        num_mats = validate_element_material_idx(element_material_idx)
-
-        constituent_phase_label_idx = None
-        constituent_orientation_idx = None
-        pat = r'\<microstructure\>[\s\S]*\(constituent\).*'
-        ms_match = re.search(pat, lines)
-        if ms_match:
-            ms_str = ms_match.group()
-            microstructure = parse_microstructure(ms_str)
-            constituent_phase_label_idx = microstructure['phase_idx']
-            constituent_orientation_idx = microstructure['texture_idx']
-
-        orientations = None
-        pat = r'\<texture\>[\s\S]*\(gauss\).*'
-        texture_match = re.search(pat, lines)
-        if texture_match:
-            texture_str = texture_match.group()
-            texture_gauss = parse_texture_gauss(texture_str)
-            orientations = {
-                'type': 'euler',
-                'euler_angles': texture_gauss['euler_angles'],
-                'euler_angle_labels': texture_gauss['euler_angle_labels'],
-                'unit_cell_alignment': {
-                    'x': 'a',
-                    'z': 'c',
-                }
+        # Only the header lines are searched by the regular expressions below:
+        lines = ''.join([handle.readline() for _ in range(num_header + 1)])
+        voxels_str = handle.read()
+
+    grid_size = None
+    grid_pat = r'grid\s+a\s+(\d+)\s+b\s+(\d+)\s+c\s+(\d+)'
+    grid_match = re.search(grid_pat, lines)
+    if grid_match:
+        grid_size = [int(i) for i in grid_match.groups()]
+    else:
+        raise ValueError('`grid` not specified in file.')
+
+    element_material_idx = parse_geom_voxels(voxels_str, grid_size)
+    del voxels_str
+    element_material_idx -= 1  # zero-indexed
+    num_mats, material_num_elements = validate_element_material_idx(
+        element_material_idx,
+        return_counts=True,
+    )
+    element_material_idx = element_material_idx.astype(
+        get_element_material_idx_dtype(num_mats, dtype),
+        copy=False,
+    )
+
+    constituent_phase_label_idx = None
+    constituent_orientation_idx = None
+    pat = r'\<microstructure\>[\s\S]*\(constituent\).*'
+    ms_match = re.search(pat, lines)
+    if ms_match:
+        ms_str = ms_match.group()
+        microstructure = parse_microstructure(ms_str)
+        constituent_phase_label_idx = microstructure['phase_idx']
+        constituent_orientation_idx = microstructure['texture_idx']
+
+    orientations = None
+    pat = r'\<texture\>[\s\S]*\(gauss\).*'
+    texture_match = re.search(pat, lines)
+    if texture_match:
+        texture_str = texture_match.group()
+        texture_gauss = parse_texture_gauss(texture_str)
+        orientations = {
+            'type': 'euler',
+            'euler_angles': texture_gauss['euler_angles'],
+            'euler_angle_labels': texture_gauss['euler_angle_labels'],
+            'unit_cell_alignment': {
+                'x': 'a',
+                'z': 'c',
             }
+        }
 
-        # Check indices in `constituent_orientation_idx` are valid, given `orientations`:
-        if ms_match and (
-            np.min(constituent_orientation_idx) < 0 or
-            np.max(constituent_orientation_idx) > len(orientations['euler_angles'])
-        ):
-            msg = 'Orientation indices in `constituent_orientation_idx` are invalid.'
-            raise ValueError(msg)
+    # Check indices in `constituent_orientation_idx` are valid, given `orientations`:
+    if ms_match and (
+        np.min(constituent_orientation_idx) < 0 or
+        np.max(constituent_orientation_idx) > len(orientations['euler_angles'])
+    ):
+        msg = 'Orientation indices in `constituent_orientation_idx` are invalid.'
+        raise ValueError(msg)
+
+    # Parse header information:
+    size_pat = (r'size\s+x\s+(\d+(?:\.\d+)*)'
+                r'\s+y\s+(\d+(?:\.\d+)*)\s+z\s+(\d+(?:\.\d+)*)')
+    size_match = re.search(size_pat, lines)
+    size = None
+    if size_match:
+        size = [float(i) for i in size_match.groups()]
+
+    origin_pat = r'origin\s+x\s+(\d+\.\d+)\s+y\s+(\d+\.\d+)\s+z\s+(\d+\.\d+)'
+    origin_match = re.search(origin_pat, lines)
+    origin = None
+    if origin_match:
+        origin = [float(i) for i in origin_match.groups()]
+
+    homo_pat = r'homogenization\s+(\d+)'
+    homo_match = re.search(homo_pat, lines)
+    material_homog_idx = None
+    if homo_match:
+        # Same homogenization for each material ID:
+        homog_idx = int(homo_match.group(1)) - 1  # zero-indexed
+        material_homog_idx = np.zeros(num_mats).astype(int) + homog_idx
+
+    com_pat = r'(geom_.*)'
+    commands = re.findall(com_pat, lines)
+
+    geometry = {
+        'grid_size': grid_size,
+        'size': size,
+        'origin': origin,
+        'orientations': orientations,
+        'element_material_idx': element_material_idx,
+        'material_num_elements': material_num_elements,
+        'material_homog_idx': material_homog_idx,
+        'constituent_phase_label_idx': constituent_phase_label_idx,
+        'constituent_orientation_idx': constituent_orientation_idx,
+        'meta': {
+            'num_header': num_header,
+            'commands': commands,
+        },
+    }
 
-        # Parse header information:
-        size_pat = (r'size\s+x\s+(\d+(?:\.\d+)*)'
-                    r'\s+y\s+(\d+(?:\.\d+)*)\s+z\s+(\d+(?:\.\d+)*)')
-        size_match = re.search(size_pat, lines)
-        size = None
-        if size_match:
-            size = [float(i) for i in size_match.groups()]
-
-        origin_pat = r'origin\s+x\s+(\d+\.\d+)\s+y\s+(\d+\.\d+)\s+z\s+(\d+\.\d+)'
-        origin_match = re.search(origin_pat, lines)
-        origin = None
-        if origin_match:
-            origin = [float(i) for i in origin_match.groups()]
-
-        homo_pat = r'homogenization\s+(\d+)'
-        homo_match = re.search(homo_pat, lines)
-        material_homog_idx = None
-        if homo_match:
-            # Same homogenization for each material ID:
-            homog_idx = int(homo_match.group(1)) - 1  # zero-indexed
-            material_homog_idx = np.zeros(num_mats).astype(int) + homog_idx
-
-        com_pat = r'(geom_.*)'
-        commands = re.findall(com_pat, lines)
-
-        geometry = {
-            'grid_size': grid_size,
-            'size': size,
-            'origin': origin,
-            'orientations': orientations,
-            'element_material_idx': element_material_idx,
-            'material_homog_idx': material_homog_idx,
-            'constituent_phase_label_idx': constituent_phase_label_idx,
-            'constituent_orientation_idx': constituent_orientation_idx,
-            'meta': {
-                'num_header': num_header,
-                'commands': commands,
-            },
-        }
+    if cache:
+        try:
+            write_geom_cache(geom_path, geometry, dtype)
+        except OSError as err:
+            warnings.warn(f'Could not write the geometry file cache: {err}')
 
     return geometry
 
 
-def read_spectral_stdout(path):
+class SpectralStdoutParser:
+    """Parser of the standard output of the DAMASK spectral solver that consumes the
+    output line by line, parsing each increment as soon as it is complete.
 
-    path = Path(path)
-    inc_split_str = r'\s#{75}'
+    Increments are delimited by lines of "#" characters. Lines before the first
+    delimiter are ignored.
 
-    with path.open('r', encoding='utf8') as handle:
-        lines = handle.read()
-
-        inc_split = re.split(inc_split_str, lines)
+    """
 
-        dg_arr = []
-        pk_arr = []
-        inc_idx = []
-        inc_pos_dat = {
-            'inc_number': [],
-            'inc_time': [],
-            'inc_cut_back': [],
-            'inc_load_case': [],
+    INC_DELIMITER = re.compile(r'\s#{75}')
+    INC_POS_KEYS = ['inc_number', 'inc_time', 'inc_cut_back', 'inc_load_case']
+    INC_POS_DTYPES = [np.int64, float, float, np.int64]
+    ERR_COMPONENTS = ['value', 'tol', 'relative']
+
+    def __init__(self):
+        self.num_increments = 0     # Number of completed (not necessarily converged) increments
+        self.err_keys = None
+        self._inc_lines = None      # None until the first delimiter is found
+        self._any_lines = False
+        self.reset_output()
+
+    def reset_output(self):
+        """Discard the parsed data that has been accumulated so far."""
+        self._dg_arr = GrowableArray((3, 3))
+        self._pk_arr = GrowableArray((3, 3))
+        self._inc_idx = GrowableArray(dtype=np.int64)
+        self._inc_pos_dat = {
+            k: GrowableArray(dtype=dtype)
+            for k, dtype in zip(self.INC_POS_KEYS, self.INC_POS_DTYPES)
         }
-        err_keys = None
-        converge_errors = None
-        warnings = []
-
-        for idx, i in enumerate(inc_split[1:]):
-
-            parsed_inc = parse_increment(i)
-            if parsed_inc['converged']:
-
-                inc_idx.extend([idx] * parsed_inc['num_iters'])
-                if idx == 0:
-                    err_keys = [j for j in parsed_inc.keys() if j.startswith('error_')]
-                    converge_errors = dict(
-                        zip(err_keys, [{'value': [], 'tol': [], 'relative': []}
-                                       for _ in err_keys])
-                    )
-                dg_arr.extend(parsed_inc.pop('deformation_gradient_aim'))
-                pk_arr.extend(parsed_inc.pop('piola_kirchhoff_stress'))
-                for j in err_keys:
-                    for k in ['value', 'tol', 'relative']:
-                        converge_errors[j][k].extend(parsed_inc[j][k])
-
-                for k in ['inc_number', 'inc_time', 'inc_cut_back', 'inc_load_case']:
-                    inc_pos_dat[k].append(parsed_inc[k])
+        self._converge_errors = {
+            j: {k: GrowableArray() for k in self.ERR_COMPONENTS}
+            for j in self.err_keys or []
+        }
+        self._warnings = []
+
+    def feed_line(self, line):
+        """Consume a line (including its line ending) of the standard output."""
+
+        if '#' * 75 not in line:
+            if self._inc_lines is not None:
+                self._inc_lines.append(line)
+            self._any_lines = True
+            return
+
+        # The delimiter must be preceded by whitespace, which may be the previous line
+        # ending:
+        prefix = '\n' if self._any_lines else ''
+        self._any_lines = True
+        parts = self.INC_DELIMITER.split(prefix + line)
+        parts[0] = parts[0][len(prefix):] if parts[0].startswith(prefix) else parts[0]
+        for part_idx, part in enumerate(parts):
+            if part_idx > 0:
+                self._end_increment()
+                self._inc_lines = []
+            if self._inc_lines is not None:
+                self._inc_lines.append(part)
+
+    def finalise(self):
+        """Parse the final increment, which is not followed by a delimiter."""
+        self._end_increment()
+        self._inc_lines = None
+
+    def _end_increment(self):
+        if self._inc_lines is None:
+            return
+        self.add_increment(parse_increment(''.join(self._inc_lines)))
+        self._inc_lines = None
+
+    def add_increment(self, parsed_inc):
+        """Add the parsed data of the next increment, as returned by `parse_increment`."""
+
+        idx = self.num_increments
+        self.num_increments += 1
+
+        if not parsed_inc['converged']:
+            self._warnings.extend(parsed_inc['warnings'])
+            return
+
+        if self.err_keys is None:
+            self.err_keys = [j for j in parsed_inc.keys() if j.startswith('error_')]
+            self._converge_errors = {
+                j: {k: GrowableArray() for k in self.ERR_COMPONENTS}
+                for j in self.err_keys
+            }
 
-            else:
-                warnings.extend(parsed_inc['warnings'])
+        self._inc_idx.extend([idx] * parsed_inc['num_iters'])
+        self._dg_arr.extend(parsed_inc['deformation_gradient_aim'])
+        self._pk_arr.extend(parsed_inc['piola_kirchhoff_stress'])
+        for j in self.err_keys:
+            for k in self.ERR_COMPONENTS:
+                self._converge_errors[j][k].extend(parsed_inc[j][k])
 
-        inc_idx = np.array(inc_idx)
-        dg_arr = np.array(dg_arr)
-        pk_arr = np.array(pk_arr)
-        for j in err_keys:
-            for k in ['value', 'tol', 'relative']:
-                converge_errors[j][k] = np.array(converge_errors[j][k])
+        for k in self.INC_POS_KEYS:
+            self._inc_pos_dat[k].append(parsed_inc[k])
+
+    def get_output(self):
+        """Get the parsed data of the increments added since the output was last reset.
 
-        for k in ['inc_number', 'inc_time', 'inc_cut_back', 'inc_load_case']:
-            inc_pos_dat[k] = np.array(inc_pos_dat[k])
+        Returns
+        -------
+        out : dict
+            Dict with the same keys as returned by `read_spectral_stdout`.
 
+        """
+
+        converge_errors = {
+            j: {k: v.to_array() for k, v in err_j.items()}
+            for j, err_j in self._converge_errors.items()
+        }
         out = {
-            'deformation_gradient_aim': dg_arr,
-            'piola_kirchhoff_stress': pk_arr,
-            'increment_idx': inc_idx,
-            'warnings': warnings,
+            'deformation_gradient_aim': self._dg_arr.to_array(),
+            'piola_kirchhoff_stress': self._pk_arr.to_array(),
+            'increment_idx': self._inc_idx.to_array(),
+            'warnings': list(self._warnings),
             **converge_errors,
-            **inc_pos_dat
+            **{k: v.to_array() for k, v in self._inc_pos_dat.items()},
         }
 
-    return out
+        return out
+
+
+class SpectralStdoutMonitor:
+    """Incrementally read the standard output file of a running spectral solver.
+
+    Each call to `poll` reads only the part of the file that has been written since the
+    previous call, and returns the data of any increments completed in the meantime.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the standard output file of the DAMASK spectral solver.
+
+    Attributes
+    ----------
+    offset : int
+        Number of bytes of the file that have been read.
+
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._reset()
+
+    def _reset(self):
+        """Discard all progress, so the file is read again from the start."""
+        self.offset = 0
+        self._partial_line = b''
+        self._parser = SpectralStdoutParser()
+
+    def poll(self, final=False):
+        """Parse the increments completed since the previous call.
+
+        Parameters
+        ----------
+        final : bool, optional
+            If True, the solver is assumed to have finished, and the last increment in
+            the file is parsed, even though it is not followed by a delimiter. By
+            default, False.
+
+        Returns
+        -------
+        out : dict
+            Dict with the same keys as returned by `read_spectral_stdout`, but including
+            only the increments (and warnings) that were completed since the previous
+            call. The values of `increment_idx` index increments from the start of
+            the file.
+
+        """
+
+        if self.path.stat().st_size < self.offset:
+            # File has been truncated or replaced, so start again:
+            self._reset()
+
+        with self.path.open('rb') as handle:
+            handle.seek(self.offset)
+            new_bytes = handle.read()
+        self.offset += len(new_bytes)
+
+        # Only parse complete lines, unless this is the final poll:
+        new_bytes = self._partial_line + new_bytes
+        if final:
+            self._partial_line = b''
+        else:
+            split_idx = new_bytes.rfind(b'\n') + 1
+            new_bytes, self._partial_line = new_bytes[:split_idx], new_bytes[split_idx:]
+
+        new_text = new_bytes.decode('utf8').replace('\r\n', '\n')
+        for line in io.StringIO(new_text):
+            self._parser.feed_line(line)
+        if final:
+            self._parser.finalise()
+
+        out = self._parser.get_output()
+        self._parser.reset_output()
+
+        return out
+
+    async def follow(self, interval=1.0, is_finished=None, idle_timeout=None):
+        """Asynchronously generate newly completed increments as they are written.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Time in seconds to wait between polls of the file. By default, 1.0.
+        is_finished : callable, optional
+            Function, called without arguments before each poll, that returns True once
+            the solver has finished writing the file (for instance, `lambda:
+            process.poll() is not None`, for a `subprocess.Popen` object `process`).
+        idle_timeout : float, optional
+            If specified, the solver is assumed to have finished once the file has not
+            grown for this number of seconds.
+
+        Yields
+        ------
+        out : dict
+            As returned by `poll`, for each poll that finds new increments or warnings.
+
+        Notes
+        -----
+        Once the solver has finished (as determined by `is_finished` or `idle_timeout`),
+        the file is polled a final time with `final=True`, so that the last increment
+        is included, and the generator returns. If neither `is_finished` nor
+        `idle_timeout` is specified, the generator never returns by itself.
+
+        """
+
+        last_growth = time.monotonic()
+        while True:
+            finished = is_finished is not None and is_finished()
+            offset = self.offset
+            if (
+                not finished and
+                idle_timeout is not None and
+                time.monotonic() - last_growth >= idle_timeout
+            ):
+                finished = True
+
+            out = self.poll(final=finished)
+            if self.offset != offset:
+                last_growth = time.monotonic()
+            if out['increment_idx'].size or out['warnings']:
+                yield out
+            if finished:
+                return
+            await asyncio.sleep(interval)
+
+
+def read_spectral_stdout(path):
+
+    path = Path(path)
+    parser = SpectralStdoutParser()
+
+    with path.open('r', encoding='utf8') as handle:
+        for line in handle:
+            parser.feed_line(line)
+        parser.finalise()
+
+    return parser.get_output()
 
 
 def read_spectral_stderr(path):
@@ -373,7 +839,103 @@ def read_spectral_stderr(path):
         return errors
 
 
-def read_HDF5_file(hdf5_path, incremental_data, operations=None):
+def read_spectral_file(path, kind):
+    """Parse a spectral solver output file, capturing any exception raised.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the standard output or standard error file.
+    kind : str
+        One of "stdout" or "stderr".
+
+    Returns
+    -------
+    path : str
+    data : dict or list or NoneType
+        As returned by `read_spectral_stdout` or `read_spectral_stderr`, or None if
+        parsing failed.
+    error : str or NoneType
+        The formatted traceback if parsing failed, otherwise None.
+
+    """
+
+    readers = {
+        'stdout': read_spectral_stdout,
+        'stderr': read_spectral_stderr,
+    }
+    try:
+        return str(path), readers[kind](path), None
+    except Exception:
+        return str(path), None, traceback.format_exc()
+
+
+def read_spectral_files(paths, kind='stdout', max_workers=None, consolidated_path=None):
+    """Parse many spectral solver output files in parallel.
+
+    Parameters
+    ----------
+    paths : list of (str or Path), or str
+        Paths to the files to parse, or a glob pattern that matches these paths.
+    kind : str, optional
+        One of "stdout" (files are parsed with `read_spectral_stdout`) or "stderr"
+        (files are parsed with `read_spectral_stderr`). By default, "stdout".
+    max_workers : int, optional
+        Maximum number of processes used to parse the files. By default, the number of
+        processors on the machine. If 1, files are parsed in the current process.
+    consolidated_path : str or Path, optional
+        If specified, additionally write all of the parsed data to a single HDF5 file at
+        this path. See `writers.write_spectral_results`.
+
+    Returns
+    -------
+    results : dict
+        Dict whose keys are the file paths, and whose values are dicts with keys:
+            data : dict or list or NoneType
+                The parsed data, or None if parsing failed.
+            error : str or NoneType
+                The formatted traceback if parsing failed, otherwise None.
+
+    """
+
+    if kind not in ['stdout', 'stderr']:
+        raise ValueError(f'`kind` must be one of "stdout" or "stderr", not "{kind}".')
+
+    if isinstance(paths, (str, Path)):
+        paths = sorted(glob.glob(str(paths), recursive=True))
+
+    kinds = [kind] * len(paths)
+    num_workers = max_workers or os.cpu_count() or 1
+    if num_workers == 1:
+        all_parsed = map(read_spectral_file, paths, kinds)
+        results = {i[0]: {'data': i[1], 'error': i[2]} for i in all_parsed}
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            chunksize = max(1, len(paths) // (4 * num_workers))
+            all_parsed = executor.map(read_spectral_file, paths, kinds, chunksize=chunksize)
+            results = {i[0]: {'data': i[1], 'error': i[2]} for i in all_parsed}
+
+    if consolidated_path:
+        write_spectral_results(results, consolidated_path, kind)
+
+    return results
+
+
+def get_HDF5_quantity_meta(inc_dat_spec):
+    """Get the metadata of an incremental quantity extracted from a DAMASK HDF5 file."""
+    meta = {
+        'path': inc_dat_spec['path'],
+        'transforms': inc_dat_spec.get('transforms'),
+        'increments': inc_dat_spec.get('increments', 1),
+    }
+    for key in ['increment_range', 'time_range', 'points']:
+        if inc_dat_spec.get(key) is not None:
+            meta[key] = inc_dat_spec[key]
+    return meta
+
+
+def read_HDF5_file(hdf5_path, incremental_data, operations=None, cache_operations=False,
+                   force_operations=False):
     """Operate on and extract data from an HDF5 file generated by a DAMASK run.
 
     Parameters
@@ -393,6 +955,18 @@ def read_HDF5_file(hdf5_path, incremental_data, operations=None):
                         If specified, take the sum the array along this axis.
                     mean_along_axes: int, optional
                         If specified, take the mean average of the array along this axis.
+            increments: int or list of int, optional
+                Increment step size, or positions of increments (e.g. `[-1]` for the final
+                increment). By default, 1.
+            increment_range: list of (int or None), optional
+                Start and stop positions of the range of increments from which to extract.
+            time_range: list of (float or None), optional
+                Minimum and maximum time of the increments from which to extract.
+            points: slice, dict, list or ndarray, optional
+                Selection of material points to extract (a slice, a dict with keys
+                "start", "stop" and "step", a boolean mask or an array of point
+                indices). Only the selected points are read from the file. See
+                `utils.get_HDF5_incremental_quantity`.
     operations : list of dict, optional
         List of methods to invoke on the DADF5 object. This is a list of dicts with the
         following keys:
@@ -403,6 +977,14 @@ def read_HDF5_file(hdf5_path, incremental_data, operations=None):
                 assumes all DADF5 method parameters are of positional-or-keyword type.
             opts : dict
                 Additional options.
+    cache_operations : bool, optional
+        If True, each completed operation (identified by its name, arguments and
+        options) is recorded in a manifest within the HDF5 file, and operations that are
+        already recorded in the manifest are not invoked again. By default, False, in
+        which case all operations are invoked.
+    force_operations : bool, optional
+        Only applicable if `cache_operations` is True. If True, all operations are
+        invoked, even if they are recorded in the manifest. By default, False.
 
     Returns
     -------
@@ -410,10 +992,19 @@ def read_HDF5_file(hdf5_path, incremental_data, operations=None):
         Dict with keys determined by the `incremental_data` list.
 
     """
-    from damask import Result
-    sim_data = Result(hdf5_path)
+    operations = operations or []
+    if cache_operations and not force_operations:
+        completed_ops = get_HDF5_operations_manifest(hdf5_path)
+        operations = [
+            i for i in operations
+            if get_HDF5_operation_key(i) not in completed_ops
+        ]
 
-    for op in operations or []:
+    if operations:
+        from damask import Result
+        sim_data = Result(hdf5_path)
+
+    for op in operations:
         func = getattr(sim_data, op['name'], None)
         if not func:
             raise AttributeError(f'The Result object has no attribute: {op["name"]}.')
@@ -440,35 +1031,437 @@ def read_HDF5_file(hdf5_path, incremental_data, operations=None):
 
             sim_data.add_Mises(label)
 
+        if cache_operations:
+            add_HDF5_operations_manifest(hdf5_path, op)
+
+    # Open the file once, and read all quantities in a single pass over the increments:
+    with HDF5ResultReader(hdf5_path) as reader:
+        all_inc_dat = reader.get_quantities(incremental_data)
+
     volume_element_response = {}
-    for inc_dat_spec in incremental_data:
-        inc_dat = get_HDF5_incremental_quantity(
-            hdf5_path=hdf5_path,
-            dat_path=inc_dat_spec['path'],
-            transforms=inc_dat_spec.get('transforms'),
-            increments=inc_dat_spec.get('increments', 1),
-        )
+    for inc_dat_spec, inc_dat in zip(incremental_data, all_inc_dat):
         volume_element_response.update({
             inc_dat_spec['name']: {
                 'data': inc_dat,
-                'meta': {
-                    'path': inc_dat_spec['path'],
-                    'transforms': inc_dat_spec.get('transforms'),
-                    'increments': inc_dat_spec.get('increments', 1),
-                },
+                'meta': get_HDF5_quantity_meta(inc_dat_spec),
+            }
+        })
+
+    return volume_element_response
+
+
+def read_HDF5_file_captured(hdf5_path, incremental_data, operations=None,
+                            cache_operations=False, force_operations=False):
+    """Invoke `read_HDF5_file`, capturing any exception raised.
+
+    Returns
+    -------
+    hdf5_path : str
+    volume_element_response : dict or NoneType
+        As returned by `read_HDF5_file`, or None if reading failed.
+    error : str or NoneType
+        The formatted traceback if reading failed, otherwise None.
+
+    """
+    try:
+        response = read_HDF5_file(
+            hdf5_path,
+            incremental_data,
+            operations,
+            cache_operations,
+            force_operations,
+        )
+        return str(hdf5_path), response, None
+    except Exception:
+        return str(hdf5_path), None, traceback.format_exc()
+
+
+def read_HDF5_files(hdf5_paths, incremental_data, operations=None, max_workers=None,
+                    cache_operations=False, force_operations=False):
+    """Extract the same data from many DAMASK HDF5 files in parallel.
+
+    Parameters
+    ----------
+    hdf5_paths : list of (str or Path), or str
+        Paths to the HDF5 files, or a glob pattern that matches these paths.
+    incremental_data : list of dict
+        List of incremental data to extract from each HDF5 file. See `read_HDF5_file`.
+    operations : list of dict, optional
+        List of methods to invoke on the DADF5 object of each file. See
+        `read_HDF5_file`.
+    max_workers : int, optional
+        Maximum number of processes used to read the files. Separate processes are used
+        (rather than threads), since h5py does not support parallel reads from multiple
+        threads. By default, the number of processors on the machine. If 1, files are
+        read in the current process.
+    cache_operations : bool, optional
+        See `read_HDF5_file`. By default, False.
+    force_operations : bool, optional
+        See `read_HDF5_file`. By default, False.
+
+    Returns
+    -------
+    campaign_response : dict
+        Dict with keys:
+            paths : list of str
+                Paths of the files that were read successfully. The order of this list
+                determines the order of the "simulation" axis of the data in
+                `volume_element_response`.
+            errors : dict
+                Formatted traceback for each file (keyed by its path) that could not be
+                read.
+            volume_element_response : dict
+                Dict with keys determined by the `incremental_data` list, as returned by
+                `read_HDF5_file`. For each quantity, if the extracted data from all files
+                are arrays of the same shape, `data` is an array with an additional
+                leading "simulation" axis. Otherwise, `data` is a list, with one element
+                per file.
+
+    """
+
+    if isinstance(hdf5_paths, (str, Path)):
+        hdf5_paths = sorted(glob.glob(str(hdf5_paths), recursive=True))
+
+    args = (
+        hdf5_paths,
+        [incremental_data] * len(hdf5_paths),
+        [operations] * len(hdf5_paths),
+        [cache_operations] * len(hdf5_paths),
+        [force_operations] * len(hdf5_paths),
+    )
+    if max_workers == 1:
+        all_read = list(map(read_HDF5_file_captured, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            all_read = list(executor.map(read_HDF5_file_captured, *args))
+
+    paths = [i[0] for i in all_read if i[2] is None]
+    errors = {i[0]: i[2] for i in all_read if i[2] is not None}
+    responses = [i[1] for i in all_read if i[2] is None]
+
+    volume_element_response = {}
+    for inc_dat_spec in incremental_data:
+        name = inc_dat_spec['name']
+        all_data = [i[name]['data'] for i in responses]
+        if (
+            all_data and
+            all(isinstance(i, np.ndarray) for i in all_data) and
+            len(set(i.shape for i in all_data)) == 1
+        ):
+            all_data = np.stack(all_data)
+        volume_element_response.update({
+            name: {
+                'data': all_data,
+                'meta': get_HDF5_quantity_meta(inc_dat_spec),
             }
         })
 
+    campaign_response = {
+        'paths': paths,
+        'errors': errors,
+        'volume_element_response': volume_element_response,
+    }
+
+    return campaign_response
+
+
+def read_volume_element_response(path, lazy=True):
+    """Read volume element response data written by
+    `writers.write_volume_element_response`.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the HDF5 file.
+    lazy : bool, optional
+        If True (the default), arrays are returned as `h5py.Dataset` objects (which may
+        be sliced like arrays, e.g. `data[-1]` for the final increment), so data is only
+        read (and decompressed) from the file when it is accessed. In this case, the file
+        remains open until all such datasets are garbage collected (or until the file is
+        closed explicitly via `data.file.close()`). If False, all data is read into
+        memory.
+
+    Returns
+    -------
+    volume_element_response : dict
+        Dict with the same structure as that returned by `read_HDF5_file`.
+
+    """
+
+    def read_response_array(dset):
+        return dset if lazy else dset[()]
+
+    volume_element_response = {}
+    f = h5py.File(str(path), 'r')
+    try:
+        for name, group in f.items():
+
+            data = group['data']
+            if isinstance(data, h5py.Group):
+                if data.attrs['kind'] == 'dict':
+                    data_items = json.loads(data.attrs['items'])
+                    data_items.update({
+                        key: read_response_array(val) for key, val in data.items()
+                    })
+                    data = data_items
+                else:
+                    data = [read_response_array(data[str(i)]) for i in range(len(data))]
+            else:
+                data = read_response_array(data)
+
+            volume_element_response.update({
+                name: {
+                    'data': data,
+                    'meta': json.loads(group.attrs['meta']),
+                }
+            })
+
+    except BaseException:
+        f.close()
+        raise
+
+    if not lazy:
+        f.close()
+
     return volume_element_response
 
 
-def read_material(path):
+# Top-level keys of a YAML mapping:
+MATERIAL_SECTION_PAT = re.compile(r'^([A-Za-z_][\w\-]*):', re.MULTILINE)
+
+
+def parse_material_str_scalar(value):
+    """Parse a YAML string scalar in the microstructure section of a material file.
+
+    Returns
+    -------
+    value : str or None
+        The string, or None if `value` is not a (simple) YAML string scalar.
+
+    """
+    if value.startswith('"'):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+        return value if isinstance(value, str) else None
+    if value.startswith("'"):
+        if len(value) < 2 or not value.endswith("'"):
+            return None
+        return value[1:-1].replace("''", "'")
+    if YAML_PLAIN_STR_PAT.fullmatch(value) and value.lower() not in YAML_RESERVED_STRS:
+        return value
+    return None
+
+
+def parse_material_microstructure(lines):
+    """Parse the microstructure section of a DAMASK material.yaml file without a general
+    YAML parser.
+
+    Parameters
+    ----------
+    lines : list of str
+        Lines of the microstructure section, excluding the "microstructure:" line.
+
+    Returns
+    -------
+    microstructure_data : dict or None
+        Dict with keys "material_homog", "constituent_material_idx",
+        "constituent_material_fraction", "constituent_phase_label" and "quaternions", or
+        None if the section is not in a form recognised by this parser, which supports
+        the layouts generated by `write_material` (and by dumping the materials list
+        with `ruamel.yaml`), in which case a general YAML parser should be used instead.
+
+    """
+
+    material_homog = []
+    const_material_idx = []
+    const_frac = []
+    const_phase = []
+    quat_comps = []
+
+    mat_keys = None
+    const_keys = None
+    in_ori_block = False
+
+    def constituent_complete():
+        return const_keys is None or (
+            const_keys == {'fraction', 'orientation', 'phase'} and
+            len(quat_comps) == 4 * len(const_frac)
+        )
+
+    def material_complete():
+        return mat_keys is None or mat_keys == {'homogenization', 'constituents'}
+
+    for line in lines:
+
+        content = line.lstrip()
+        if not content or content.startswith('#'):
+            continue
+        indent = len(line) - len(content)
+
+        if in_ori_block:
+            if indent == 4 and content.startswith('- '):
+                quat_comps.append(content[2:])
+                continue
+            in_ori_block = False
+
+        if content.startswith('- '):
+            if indent == 0:
+                # New material:
+                if not constituent_complete() or not material_complete():
+                    return None
+                mat_keys = set()
+                const_keys = None
+            elif indent == 2 and mat_keys is not None and 'constituents' in mat_keys:
+                # New constituent:
+                if not constituent_complete():
+                    return None
+                const_keys = set()
+                const_material_idx.append(len(material_homog) - 1)
+            else:
+                return None
+            content = content[2:]
+            indent += 2
+
+        key, sep, value = content.partition(':')
+        if not sep or value[:1] not in ('', ' '):
+            return None
+        value = value.strip()
+
+        if indent == 2 and mat_keys is not None and key not in mat_keys:
+            if key == 'homogenization':
+                homog = parse_material_str_scalar(value)
+                if homog is None:
+                    return None
+                material_homog.append(homog)
+            elif key == 'constituents':
+                # Constituents are assigned to the most recent homogenization:
+                if 'homogenization' not in mat_keys or value not in ('', '[]'):
+                    return None
+            else:
+                return None
+            mat_keys.add(key)
+
+        elif indent == 4 and const_keys is not None and key not in const_keys:
+            if key == 'fraction':
+                const_frac.append(value)
+            elif key == 'orientation':
+                if not value:
+                    in_ori_block = True
+                elif value.startswith('[') and value.endswith(']'):
+                    comps = value[1:-1].split(',')
+                    if len(comps) != 4:
+                        return None
+                    quat_comps.extend(comps)
+                else:
+                    return None
+            elif key == 'phase':
+                phase = parse_material_str_scalar(value)
+                if phase is None:
+                    return None
+                const_phase.append(phase)
+            else:
+                return None
+            const_keys.add(key)
+
+        else:
+            return None
+
+    if not constituent_complete() or not material_complete():
+        return None
+
+    try:
+        const_frac = np.array(const_frac, dtype=float)
+        quats = np.array(quat_comps, dtype=float).reshape(-1, 4)
+    except ValueError:
+        # e.g. YAML-specific float representations, such as ".nan":
+        return None
+
+    microstructure_data = {
+        'material_homog': np.array(material_homog),
+        'constituent_material_idx': np.array(const_material_idx, dtype=int),
+        'constituent_material_fraction': const_frac,
+        'constituent_phase_label': np.array(const_phase),
+        'quaternions': quats,
+    }
+
+    return microstructure_data
+
+
+def read_material_sidecar(path):
+    """Read the microstructure data from the binary sidecar file of a material file, as
+    written by `write_material`.
+
+    Returns
+    -------
+    microstructure_data : dict
+        As returned by `parse_material_microstructure`, except that the values of
+        "material_homog" and "constituent_phase_label" are `pandas.Categorical` objects
+        constructed from the label codes and tables stored in the sidecar file.
+
+    """
+    with np.load(str(path), allow_pickle=False) as sidecar:
+        microstructure_data = {
+            'material_homog': pandas.Categorical.from_codes(
+                sidecar['material_homog_code'],
+                categories=sidecar['homog_labels'],
+            ),
+            'constituent_material_idx': sidecar['constituent_material_idx'],
+            'constituent_material_fraction': sidecar['constituent_material_fraction'],
+            'constituent_phase_label': pandas.Categorical.from_codes(
+                sidecar['constituent_phase_code'],
+                categories=sidecar['phase_labels'],
+            ),
+            'quaternions': sidecar['quaternions'],
+        }
+    return microstructure_data
+
+
+def split_material_microstructure(material_str):
+    """Split the microstructure section from the contents of a material file.
+
+    Returns
+    -------
+    other_str : str
+        The contents of the material file without the microstructure section.
+    microstructure_lines : list of str or None
+        The lines of the microstructure section (excluding the "microstructure:" line),
+        or None if there is no such (block) section.
+
+    """
+
+    section_starts = [
+        (i.group(1), i.start()) for i in MATERIAL_SECTION_PAT.finditer(material_str)
+    ]
+    for sec_idx, (key, sec_start) in enumerate(section_starts):
+        if key == 'microstructure':
+            sec_end = (section_starts[sec_idx + 1][1] if sec_idx + 1 < len(section_starts)
+                       else len(material_str))
+            sec_lines = material_str[sec_start:sec_end].splitlines()
+            if sec_lines[0][len('microstructure:'):].strip():
+                break
+            other_str = material_str[:sec_start] + material_str[sec_end:]
+            return other_str, sec_lines[1:]
+
+    return material_str, None
+
+
+def read_material(path, use_sidecar=True, categorical=False):
     """Parse a DAMASK material.yaml input file.
 
     Parameters
     ----------
     path : str or Path
         Path to the DAMASK material.yaml file.
+    use_sidecar : bool, optional
+        If True (the default), and a binary sidecar file written by `write_material`
+        exists and is newer than the material file, the microstructure data is loaded
+        from the sidecar file instead.
+    categorical : bool, optional
+        If True, the volume element keys `constituent_phase_label` and `material_homog`
+        are returned as `pandas.Categorical` objects (integer codes and a table of
+        distinct labels), rather than as arrays of str. False by default.
 
     Returns
     -------
@@ -489,14 +1482,16 @@ def read_material(path):
                     constituent_material_fraction: ndarray of shape (N,) of float
                         The fraction that each constituent occupies within its respective
                         material, where N is the number of constituents.
-                    constituent_phase_label : ndarray of shape (N,) of str
+                    constituent_phase_label : ndarray of shape (N,) of str or
+                                              pandas.Categorical
                         Determines the phase label of each constituent, where N is the
                         number of constituents.
                     constituent_orientation_idx : ndarray of shape (N,) of int
                         Determines the orientation (as an index into `orientations`)
                         associated with each constituent, where N is the number of
                         constituents.
-                    material_homog : ndarray of shape (M,) of str
+                    material_homog : ndarray of shape (M,) of str or
+                                     pandas.Categorical
                         Determines the homogenization scheme (from a list of available
                         homogenization schemes defined elsewhere) to which each material
                         belongs, where M is the number of materials.
@@ -507,38 +1502,76 @@ def read_material(path):
                             quaternions : ndarray of shape (R, 4) of float, optional
                                 Array of R row four-vectors of unit quaternions. Specify
                                 either `quaternions` or `euler_angles`.
+                            unit_cell_alignment : dict
+                                Value is `{'x': 'a'}`, which is the DAMASK convention.
+
+    Notes
+    -----
+    The (potentially very large) "microstructure" section is parsed directly into
+    arrays if it has the layout generated by `write_material`; otherwise, it is parsed
+    as YAML. The remaining sections are always parsed as YAML.
 
     """
 
-    yaml = YAML(typ='safe')
-    material_dat = yaml.load(Path(path))
+    path = Path(path)
+    material_str = path.read_text(encoding='utf-8')
+    other_str, microstructure_lines = split_material_microstructure(material_str)
+
+    microstructure_data = None
+    sidecar_path = get_material_sidecar_path(path)
+    if (
+        use_sidecar and
+        microstructure_lines is not None and
+        sidecar_path.exists() and
+        sidecar_path.stat().st_mtime_ns >= path.stat().st_mtime_ns
+    ):
+        microstructure_data = read_material_sidecar(sidecar_path)
+    elif microstructure_lines is not None:
+        microstructure_data = parse_material_microstructure(microstructure_lines)
 
-    material_homog = []
-    const_material_idx = []
-    const_material_fraction = []
-    const_phase_label = []
-    const_orientation_idx = []
-    orientations = {
-        'type': 'quat',
-        'quaternions': [],
-    }
+    yaml = YAML(typ='safe')
+    material_dat = yaml.load(other_str if microstructure_data is not None else material_str)
+
+    if microstructure_data is None:
+        # Parse the general YAML microstructure list:
+        materials = material_dat['microstructure']
+        const_material_idx = [
+            mat_idx
+            for mat_idx, material in enumerate(materials)
+            for _ in material['constituents']
+        ]
+        consts = [j for i in materials for j in i['constituents']]
+        microstructure_data = {
+            'material_homog': np.array([i['homogenization'] for i in materials]),
+            'constituent_material_idx': np.array(const_material_idx, dtype=int),
+            'constituent_material_fraction': np.array(
+                [i['fraction'] for i in consts], dtype=float),
+            'constituent_phase_label': np.array([i['phase'] for i in consts]),
+            'quaternions': np.array(
+                [i['orientation'] for i in consts], dtype=float).reshape(-1, 4),
+        }
 
-    for mat_idx, material in enumerate(material_dat['microstructure']):
-        material_homog.append(material['homogenization'])
-        for const in material['constituents']:
-            const_material_idx.append(mat_idx)
-            const_material_fraction.append(const['fraction'])
-            const_phase_label.append(const['phase'])
-            orientations['quaternions'].append(const['orientation'])
-            const_orientation_idx.append(len(const_orientation_idx))
+    for key in ['constituent_phase_label', 'material_homog']:
+        labels = microstructure_data[key]
+        if categorical and not isinstance(labels, pandas.Categorical):
+            microstructure_data[key] = pandas.Categorical(labels)
+        elif not categorical and isinstance(labels, pandas.Categorical):
+            codes, table = get_label_codes(labels)
+            microstructure_data[key] = table[codes]
 
     vol_elem = {
-        'constituent_material_idx': const_material_idx,
-        'constituent_material_fraction': const_material_fraction,
-        'constituent_phase_label': const_phase_label,
-        'constituent_orientation_idx': const_orientation_idx,
-        'material_homog': material_homog,
-        'orientations': orientations,
+        'constituent_material_idx': microstructure_data['constituent_material_idx'],
+        'constituent_material_fraction': microstructure_data[
+            'constituent_material_fraction'],
+        'constituent_phase_label': microstructure_data['constituent_phase_label'],
+        'constituent_orientation_idx': np.arange(
+            len(microstructure_data['constituent_material_idx'])),
+        'material_homog': microstructure_data['material_homog'],
+        'orientations': {
+            'type': 'quat',
+            'quaternions': microstructure_data['quaternions'],
+            'unit_cell_alignment': {'x': 'a'},
+        },
     }
     material_data = {
         'volume_element': vol_elem,
@@ -550,7 +1583,8 @@ def read_material(path):
     return material_data
 
 
-def geom_to_volume_element(geom_path, phase_labels, homog_label, orientations=None):
+def geom_to_volume_element(geom_path, phase_labels, homog_label, orientations=None,
+                           cache=False, dtype=None):
     """Read a DAMASK geom file and parse to a volume element.
 
     Parameters
@@ -583,6 +1617,11 @@ def geom_to_volume_element(geom_path, phase_labels, homog_label, orientations=No
                 convention (rotations are about Z, new-X, new-new-Z).        
             unit_cell_alignment : dict
                 Alignment of the unit cell.
+    cache : bool, optional
+        If True, use the cache of the parsed geometry file. See `read_geom`. By default,
+        False.
+    dtype : dtype-like, optional
+        Integer dtype of `element_material_idx`. See `read_geom`.
 
     Returns
     -------
@@ -590,7 +1629,7 @@ def geom_to_volume_element(geom_path, phase_labels, homog_label, orientations=No
 
     """
 
-    geom_dat = read_geom(geom_path)
+    geom_dat = read_geom(geom_path, cache=cache, dtype=dtype)
     volume_element = {
         'orientations': orientations or geom_dat['orientations'],
         'element_material_idx': geom_dat['element_material_idx'],
@@ -3,10 +3,13 @@
 from pathlib import Path
 from subprocess import run, PIPE
 import copy
+import json
 import re
+import zlib
 
 import numpy as np
 import h5py
+import pandas
 
 from damask_parse.rotation import rot_mat2euler, euler2rot_mat_n
 from damask_parse.quats import euler2quat, axang2quat, multiply_quaternions
@@ -39,6 +42,69 @@ def zeropad(num, largest):
     return padded
 
 
+class GrowableArray:
+    """An array that supports amortised constant-time appending along its first axis.
+
+    Parameters
+    ----------
+    shape : tuple of int, optional
+        Shape of each item in the array. By default, items are scalars.
+    dtype : data-type, optional
+        Data type of the array. By default, float.
+    capacity : int, optional
+        Initial number of items for which storage is allocated. By default, 16.
+
+    """
+
+    def __init__(self, shape=(), dtype=float, capacity=16):
+        self._data = np.empty((max(capacity, 1),) + tuple(shape), dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def reserve(self, size):
+        """Ensure there is storage for at least `size` items."""
+        capacity = self._data.shape[0]
+        if size > capacity:
+            new_data = np.empty(
+                (max(size, 2 * capacity),) + self._data.shape[1:],
+                dtype=self._data.dtype,
+            )
+            new_data[:self._size] = self._data[:self._size]
+            self._data = new_data
+
+    def append(self, item):
+        """Append a single item."""
+        self.reserve(self._size + 1)
+        self._data[self._size] = item
+        self._size += 1
+
+    def extend(self, items):
+        """Append an array-like of items."""
+        items = np.asarray(items, dtype=self._data.dtype)
+        num_items = items.shape[0]
+        self.reserve(self._size + num_items)
+        self._data[self._size:self._size + num_items] = items
+        self._size += num_items
+
+    @property
+    def array(self):
+        """View of the items in the array."""
+        return self._data[:self._size]
+
+    def to_array(self):
+        """Get a copy of the items in the array, without any unused storage."""
+        return self.array.copy()
+
+
+def get_read_only_view(arr):
+    """Get a view of an array through which the array cannot be modified."""
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
 def get_num_header_lines(path):
     """Get the number of header lines from a file produced by DAMASK.
 
@@ -53,8 +119,12 @@ def get_num_header_lines(path):
 
     """
 
+    # The header line is at the top of the file, so avoid reading the whole file:
     with Path(path).open() as handle:
-        return int(re.search(r'(\d+)\sheader', handle.read()).group(1))
+        for ln in handle:
+            match = re.search(r'(\d+)\sheader', ln)
+            if match:
+                return int(match.group(1))
 
 
 def get_header_lines(path):
@@ -240,6 +310,31 @@ def format_1D_masked_array(arr, fmt='{:.10g}', fill_symbol='*'):
     return arr_fmt
 
 
+# Strings that may be emitted as plain (unquoted) YAML scalars:
+YAML_PLAIN_STR_PAT = re.compile(r'[A-Za-z_][A-Za-z0-9_\-]*')
+YAML_RESERVED_STRS = {
+    'y', 'n', 'yes', 'no', 'on', 'off', 'true', 'false', 'null', 'nan', 'inf',
+}
+
+
+def format_yaml_str(value):
+    """Format a string as a YAML scalar, quoting it (as a JSON string, which is also a
+    valid YAML double-quoted scalar) if it could otherwise be read as a different
+    type."""
+    if YAML_PLAIN_STR_PAT.fullmatch(value) and value.lower() not in YAML_RESERVED_STRS:
+        return value
+    return json.dumps(value)
+
+
+def format_yaml_float(value):
+    """Format a float as a YAML scalar, in the same way as `ruamel.yaml`."""
+    if value != value:
+        return '.nan'
+    if value in (np.inf, -np.inf):
+        return '.inf' if value > 0 else '-.inf'
+    return repr(float(value)).lower()
+
+
 def parse_damask_spectral_version_info(executable='DAMASK_spectral'):
     'Parse the DAMASK version number and compiler options from `DAMASK_spectral --help`.'
 
@@ -261,7 +356,7 @@ def parse_damask_spectral_version_info(executable='DAMASK_spectral'):
 
 
 def volume_element_from_2D_microstructure(microstructure_image, phase_label, homog_label,
-                                          depth=1, image_axes=['y', 'x']):
+                                          depth=1, image_axes=['y', 'x'], dtype=None):
     """Extrude a 2D microstructure by a given depth to form a 3D volume element.
 
     Parameters
@@ -280,6 +375,10 @@ def volume_element_from_2D_microstructure(microstructure_image, phase_label, hom
         By how many voxels the microstructure should be extruded. By default, 1.
     image_axes : list, optional
         Directions along the ndarray axes. Possible values ('x', 'y', 'z')
+    dtype : dtype-like, optional
+        Integer dtype of `element_material_idx`. By default, the smallest signed integer
+        dtype that can store the grain indices is used (see
+        `get_element_material_idx_dtype`).
 
     Returns
     -------
@@ -295,8 +394,10 @@ def volume_element_from_2D_microstructure(microstructure_image, phase_label, hom
     image_axes.append(3 - sum(image_axes))
 
     # extrude and then switch around the axes to x, y, z order
-    grain_idx = np.array(microstructure_image['grains'])[:, :, np.newaxis]
-    grain_idx = np.tile(grain_idx, (1, 1, depth))
+    grain_idx = np.asarray(microstructure_image['grains'])
+    num_grains = int(np.max(grain_idx)) + 1
+    grain_idx = grain_idx.astype(get_element_material_idx_dtype(num_grains, dtype))
+    grain_idx = np.tile(grain_idx[:, :, np.newaxis], (1, 1, depth))
     grain_idx = np.ascontiguousarray(grain_idx.transpose(image_axes))
 
     volume_element = {
@@ -317,14 +418,14 @@ def volume_element_from_2D_microstructure(microstructure_image, phase_label, hom
 
 
 def add_volume_element_buffer_zones(volume_element, buffer_sizes, phase_ids, phase_labels,
-                                    homog_label, order=['x', 'y', 'z']):
+                                    homog_label, order=['x', 'y', 'z'], dtype=None):
     """Add buffer material regions to a volume element.
 
     Parameters
     ----------
-    volume_element : dict
+    volume_element : dict or VolumeElement
         Dict representing the volume element that can be validated via
-        `validate_volume_element`.
+        `validate_volume_element`, or a `VolumeElement`.
     buffer_sizes : list of int, length 6
         Size of buffer on each face [-x, +x, -y, +y, -z, +z]
     phase_ids : list of int, length 6
@@ -335,28 +436,35 @@ def add_volume_element_buffer_zones(volume_element, buffer_sizes, phase_ids, pha
         Homogenization scheme label.
     order : list of str, optional
         Order to add the zones in, default [x, y, z]
+    dtype : dtype-like, optional
+        Integer dtype of the new `element_material_idx`. By default, the smallest signed
+        integer dtype that can store the material indices, including those of the buffer
+        materials, is used (see `get_element_material_idx_dtype`).
 
     Returns
     -------
-    volume_element : dict
-        Dict representing modified volume element.
+    volume_element : dict or VolumeElement
+        Dict representing modified volume element (or a new `VolumeElement`, if a
+        `VolumeElement` was passed).
 
     """
 
-    volume_element = validate_volume_element(volume_element)
+    # Materials are appended to a copy:
+    return_dict = not isinstance(volume_element, VolumeElement)
+    volume_element = VolumeElement.from_dict(volume_element)
 
     conv_order = {'x': 0, 'y': 1, 'z': 2}
     order = [conv_order[axis] for axis in order]
 
     # new grid dimensions
-    grid = volume_element['grid_size']  # tuple
+    grid = tuple(volume_element.grid_size)
     delta_grid = tuple(buffer_sizes[2*i] + buffer_sizes[2*i + 1] for i in range(3))
     new_grid = tuple(a + b for a, b in zip(grid, delta_grid))
 
-    if 'size' in volume_element:
+    if volume_element.size is not None:
         # scale size based on material added
         new_size = tuple(s / og * ng for og, ng, s in zip(grid,
-                                                          new_grid, volume_element['size']))
+                                                          new_grid, volume_element.size))
 
     # validate new phases
     phase_ids_unq = sorted(set(pid for pid, bs in zip(phase_ids, buffer_sizes) if bs > 0))
@@ -365,53 +473,26 @@ def add_volume_element_buffer_zones(volume_element, buffer_sizes, phase_ids, pha
     if len(phase_labels) != len(phase_ids_unq):
         raise ValueError("Issue with buffer phase labels.")
 
-    # new phase and grain ids to add. 1 grain per phase
-    material_idx = volume_element['element_material_idx']
-    next_material_id = material_idx.max() + 1
-    next_ori_idx = volume_element['orientations']['quaternions'].shape[0]
-
-    # add a single-constituent material for each buffer phase:
-    new_material_ids = []
-    for i in range(len(phase_ids_unq)):
-        volume_element['material_homog'] = np.append(
-            volume_element['material_homog'],
-            homog_label,
-        )
-        volume_element['constituent_phase_label'] = np.append(
-            volume_element['constituent_phase_label'],
-            phase_labels[i],
-        )
-        volume_element['constituent_material_fraction'] = np.append(
-            volume_element['constituent_material_fraction'],
-            1.0,
-        )
-        volume_element['constituent_material_idx'] = np.append(
-            volume_element['constituent_material_idx'],
-            next_material_id,
-        )
-        volume_element['constituent_orientation_idx'] = np.append(
-            volume_element['constituent_orientation_idx'],
-            next_ori_idx,
-        )
-        new_material_ids.append(next_material_id)
-
-        next_material_id += 1
-        next_ori_idx += 1
-
-    # add a new orientation (identity) for each new material:
+    # add a single-constituent material, with a new (identity) orientation, for each
+    # buffer phase:
     identity_oris = np.zeros((len(phase_ids_unq), 4))
     identity_oris[:, 0] = 1
-    volume_element['orientations']['quaternions'] = np.vstack([
-        volume_element['orientations']['quaternions'],
-        identity_oris,
-    ])
+    new_ori_idx = volume_element.add_orientations(identity_oris)
+    new_material_ids = [
+        volume_element.add_material(homog_label, phase_labels[i], [new_ori_idx[i]])
+        for i in range(len(phase_ids_unq))
+    ]
 
     # add the buffer regions
+    material_idx = volume_element.element_material_idx.astype(
+        get_element_material_idx_dtype(volume_element.num_materials, dtype),
+        copy=False,
+    )
     for axis in order:
         if delta_grid[axis] == 0:
             continue
 
-        new_blocks = []
+        new_blocks = [material_idx]
         for i in range(2):
             buffer_size = buffer_sizes[2*axis+i]
             if buffer_size <= 0:
@@ -422,23 +503,19 @@ def add_volume_element_buffer_zones(volume_element, buffer_sizes, phase_ids, pha
             buffer_shape = list(material_idx.shape)
             buffer_shape[axis] = buffer_size
 
-            new_block = np.full(buffer_shape, material_id)
-            new_blocks.append(new_block)
-
+            new_block = np.full(buffer_shape, material_id, dtype=material_idx.dtype)
             if i == 0:
-                new_blocks.append(material_idx)
+                new_blocks.insert(0, new_block)
+            else:
+                new_blocks.append(new_block)
 
         material_idx = np.concatenate(new_blocks, axis=axis)
 
-    volume_element.update(
-        grid_size=new_grid,
-        element_material_idx=material_idx,
-    )
+    volume_element.element_material_idx = material_idx
+    if volume_element.size is not None:
+        volume_element.size = new_size
 
-    if 'size' in volume_element:
-        volume_element.update(size=new_size)
-
-    return volume_element
+    return volume_element.to_dict() if return_dict else volume_element
 
 
 def align_orientations(ori, orientation_coordinate_system, model_coordinate_system):
@@ -492,7 +569,605 @@ def align_orientations(ori, orientation_coordinate_system, model_coordinate_syst
     print(f'New Euler angles:\n{ori}')
 
 
-def get_HDF5_incremental_quantity(hdf5_path, dat_path, transforms=None, increments=1):
+def get_HDF5_increment_names(hdf5_file):
+    """Get the names of the increment groups in a DAMASK HDF5 file, in increment order.
+
+    Parameters
+    ----------
+    hdf5_file : h5py.File
+        Open DAMASK HDF5 file.
+
+    Returns
+    -------
+    incs : list of str
+
+    """
+    incs = [i for i in hdf5_file.keys() if 'inc' in i]
+    incs = sorted(incs, key=lambda i: int(re.search(r'\d+', i).group()))
+    return incs
+
+
+def read_HDF5_increments(hdf5_file, incs, dat_path):
+    """Read a dataset from each of a list of increment groups into a single array.
+
+    Parameters
+    ----------
+    hdf5_file : h5py.File
+        Open DAMASK HDF5 file.
+    incs : list of str
+        Names of the increment groups from which to read the dataset.
+    dat_path : str
+        Path of the dataset within each increment group.
+
+    Returns
+    -------
+    data : ndarray
+        Data from each increment, stacked along a new zeroth axis.
+
+    """
+
+    first_dset = hdf5_file[incs[0]][dat_path]
+    data = np.empty((len(incs),) + first_dset.shape, dtype=first_dset.dtype)
+    for idx, inc in enumerate(incs):
+        hdf5_file[inc][dat_path].read_direct(data, dest_sel=np.s_[idx])
+
+    return data
+
+
+def iter_HDF5_incremental_quantity(hdf5_path, dat_path, increments=1, chunk_size=None,
+                                   increment_range=None, time_range=None):
+    """Accessing HDF5 file directly, generate data defined at each increment, without
+    loading all increments into memory.
+
+    Parameters
+    ----------
+    hdf5_path : Path or str
+        Path to the HDF5 file generated by DAMASK
+    dat_path : str
+        Forward slash delimeted str path within the DAMASK HDF5 file of the incremental
+        data to extract. This path must exist within each `incrementXXXXX` group in the
+        file. Example: "constituent/1_Al/generic/epsilon_V^0(Fp)_vM".
+    increments : int or list of int, optional
+        Increment step size, or positions of increments. By default, 1, in which case
+        data for every increment will be generated. See `get_HDF5_incremental_quantity`.
+    chunk_size : int, optional
+        If specified, generate arrays that stack the data of this many increments along
+        a new zeroth axis (the final array may contain fewer increments). By default,
+        the data of a single increment is generated at a time.
+    increment_range : list of (int or None), optional
+        See `get_HDF5_incremental_quantity`.
+    time_range : list of (float or None), optional
+        See `get_HDF5_incremental_quantity`.
+
+    Yields
+    ------
+    data : ndarray or dict
+        Data of the next increment, or of the next chunk of increments if `chunk_size` is
+        specified. Orientation data (a `dat_path` ending in "O") is generated as an
+        orientation dict, as returned by `get_HDF5_orientation_data`.
+
+    """
+
+    is_orientation = dat_path.split('/')[-1] == 'O'
+    with HDF5ResultReader(hdf5_path) as reader:
+
+        incs = reader.select_increments(increments, increment_range, time_range)
+        if chunk_size is None:
+            for inc in incs:
+                data = reader.get_increment_group(inc)[dat_path][()]
+                yield get_HDF5_orientation_data(data) if is_orientation else data
+            return
+
+        for chunk_start in range(0, len(incs), chunk_size):
+            chunk_incs = incs[chunk_start:chunk_start + chunk_size]
+            data = read_HDF5_increments(reader.file, chunk_incs, dat_path)
+            yield get_HDF5_orientation_data(data) if is_orientation else data
+
+
+def get_HDF5_orientation_data(data):
+    """Cast orientation data read from a DAMASK HDF5 file to an orientation dict.
+
+    Parameters
+    ----------
+    data : ndarray
+        Orientation data with a structured datatype of the four quaternion components.
+
+    Returns
+    -------
+    orientations : dict
+        Dict with keys "type", "quaternions" (flattened to an array with a trailing axis
+        of length four, in the P=-1 convention), "unit_cell_alignment" and "P".
+
+    """
+    # flatten structured datatype for orientations
+    data = data.view((data.dtype[data.dtype.names[0]], len(data.dtype)))
+
+    # cast to orientation dict
+    return {
+        'type': 'quat',
+        'quaternions': data, # P=-1 convention
+        'unit_cell_alignment': {'x': 'a'},
+        'P': -1,
+    }
+
+
+def apply_HDF5_transforms(data, transforms):
+    """Apply a list of transforms (as accepted by `get_HDF5_incremental_quantity`) to an
+    array."""
+    for i in transforms:
+        if 'mean_along_axes' in i:
+            data = np.mean(data, get_transform_axes(i['mean_along_axes']))
+        if 'sum_along_axes' in i:
+            data = np.sum(data, get_transform_axes(i['sum_along_axes']))
+    return data
+
+
+def get_transform_axes(axes):
+    """Get the axes of a transform in a form accepted by NumPy reduction functions."""
+    if isinstance(axes, (list, tuple)):
+        return tuple(axes)
+    return axes
+
+
+def split_HDF5_transforms(transforms, inc_ndim):
+    """Split transforms into those that can be applied to each increment separately, and
+    those that must be applied to the stacked increments.
+
+    Parameters
+    ----------
+    transforms : list of dict
+        Transforms, as accepted by `get_HDF5_incremental_quantity`, where the zeroth axis
+        is the increment axis.
+    inc_ndim : int
+        Number of dimensions of the data at a single increment.
+
+    Returns
+    -------
+    inc_transforms : list of dict
+        The leading transforms that do not reduce along the increment axis, with their
+        axes adjusted to apply to the data of a single increment.
+    stacked_transforms : list of dict
+        The remaining transforms, to be applied to the stacked increments.
+
+    """
+
+    # Separate each transform into single operations, in the order they are applied:
+    ops = [
+        {key: i[key]}
+        for i in transforms or []
+        for key in ['mean_along_axes', 'sum_along_axes'] if key in i
+    ]
+
+    inc_transforms = []
+    ndim = inc_ndim + 1
+    for op_idx, op in enumerate(ops):
+        (key, axes), = op.items()
+        axes = get_transform_axes(axes)
+        axes_tup = axes if isinstance(axes, tuple) else (axes,)
+        if (
+            any(not isinstance(i, (int, np.integer)) or not -ndim <= i < ndim
+                for i in axes_tup) or
+            0 in [i % ndim for i in axes_tup]
+        ):
+            # Reduces along the increment axis (or is invalid and left to NumPy):
+            return inc_transforms, ops[op_idx:]
+
+        inc_axes = tuple((i % ndim) - 1 for i in axes_tup)
+        inc_transforms.append({key: inc_axes if isinstance(axes, tuple) else inc_axes[0]})
+        ndim -= len(set(inc_axes))
+
+    return inc_transforms, []
+
+
+def get_HDF5_point_selection(points, num_points):
+    """Resolve a selection of material points into a form that h5py can read directly
+    from a dataset.
+
+    Parameters
+    ----------
+    points : slice, dict, list or ndarray
+        Selection along the zeroth (material point) axis of the dataset of each
+        increment. This may be a `slice`, a dict with (any of) the keys "start", "stop"
+        and "step" (which are passed to `slice`), a boolean mask of length `num_points`,
+        or an array of point indices (which may be unordered and include repeats).
+    num_points : int
+        Length of the zeroth axis of the dataset.
+
+    Returns
+    -------
+    source_sel : slice or ndarray
+        Selection to read from the dataset; either a slice with a positive step, or an
+        array of strictly increasing point indices.
+    reorder : ndarray or None
+        If not None, indices into the data read using `source_sel` that recover the
+        requested order of points.
+    num_selected : int
+        Number of selected points.
+
+    """
+
+    if isinstance(points, dict):
+        points = slice(points.get('start'), points.get('stop'), points.get('step'))
+
+    if isinstance(points, slice):
+        start, stop, step = points.indices(num_points)
+        if step > 0:
+            return slice(start, stop, step), None, len(range(start, stop, step))
+        points = np.arange(start, stop, step)
+
+    points = np.asarray(points)
+    if points.dtype == bool:
+        if points.shape != (num_points,):
+            msg = (f'Boolean mask of points must have shape ({num_points},), but has '
+                   f'shape {points.shape}.')
+            raise ValueError(msg)
+        points = np.flatnonzero(points)
+
+    elif points.ndim != 1 or (points.size and not np.issubdtype(points.dtype, np.integer)):
+        raise ValueError('Points must be a slice, a boolean mask or a 1D array of '
+                         'integer point indices.')
+
+    points = points.astype(np.intp)
+    if np.any((points < -num_points) | (points >= num_points)):
+        msg = f'Point indices must be within the range [-{num_points}, {num_points}).'
+        raise ValueError(msg)
+    points = points % num_points if num_points else points
+
+    # h5py requires point indices to be strictly increasing:
+    source_sel, reorder = np.unique(points, return_inverse=True)
+    if source_sel.size == points.size:
+        reorder = None if np.all(reorder == np.arange(points.size)) else reorder
+
+    return source_sel, reorder, points.size
+
+
+def read_HDF5_point_selection(dset, source_sel, reorder, dest, dest_sel=()):
+    """Read a selection of material points from a dataset into an existing array.
+
+    Parameters
+    ----------
+    dset : h5py.Dataset
+    source_sel, reorder
+        As returned by `get_HDF5_point_selection`.
+    dest : ndarray
+        Array into which to read the data.
+    dest_sel : tuple or slice, optional
+        Selection within `dest` into which the data are to be read. By default, all of
+        `dest`.
+
+    """
+
+    if isinstance(source_sel, slice):
+        dset.read_direct(dest, source_sel=np.s_[source_sel], dest_sel=dest_sel)
+    elif source_sel.size:
+        data = dset[source_sel]
+        dest[dest_sel] = data[reorder] if reorder is not None else data
+
+
+class HDF5IncrementalQuantity:
+    """Extraction of a quantity from a DAMASK HDF5 file, as its increments are read.
+
+    Parameters
+    ----------
+    dat_path : str
+        Path of the dataset within each increment group.
+    incs : list of str
+        Names of the increment groups from which the dataset is to be read.
+    transforms : list of dict, optional
+        Transforms, as accepted by `get_HDF5_incremental_quantity`.
+    points : slice, dict, list or ndarray, optional
+        Selection of material points, as accepted by `get_HDF5_point_selection`. By
+        default, all points are read.
+
+    """
+
+    def __init__(self, dat_path, incs, transforms=None, points=None):
+        self.dat_path = dat_path
+        self.incs = incs
+        self.transforms = transforms
+        self.points = points
+        self.is_orientation = dat_path.split('/')[-1] == 'O'
+
+        self._source_sel = None
+        self._reorder = None
+
+        self._data = None
+        self._inc_data = None
+        self._initialised = False
+        self._inc_transforms = []
+        self._stacked_transforms = transforms
+
+    def read_increment(self, idx, inc_group):
+        """Read the dataset from the increment group at position `idx` in `incs`."""
+
+        dset = inc_group[self.dat_path]
+        if not self._initialised:
+            # Increments are not necessarily read in the order of `incs`:
+            self._initialised = True
+            inc_shape = dset.shape
+            if self.points is not None:
+                self._source_sel, self._reorder, num_selected = get_HDF5_point_selection(
+                    self.points,
+                    dset.shape[0],
+                )
+                inc_shape = (num_selected,) + dset.shape[1:]
+            if self.transforms and not self.is_orientation:
+                self._inc_transforms, self._stacked_transforms = split_HDF5_transforms(
+                    self.transforms,
+                    dset.ndim,
+                )
+            if self._inc_transforms:
+                self._inc_data = np.empty(inc_shape, dtype=dset.dtype)
+            else:
+                self._data = np.empty((len(self.incs),) + inc_shape, dtype=dset.dtype)
+
+        if self._inc_transforms:
+            # Reduce each increment as it is read:
+            self._read(dset, self._inc_data)
+            inc_data_trans = apply_HDF5_transforms(self._inc_data, self._inc_transforms)
+            if self._data is None:
+                self._data = np.empty(
+                    (len(self.incs),) + np.shape(inc_data_trans),
+                    dtype=np.result_type(inc_data_trans),
+                )
+            self._data[idx] = inc_data_trans
+        else:
+            self._read(dset, self._data, np.s_[idx])
+
+    def _read(self, dset, dest, dest_sel=()):
+        """Read the (selected points of the) dataset into `dest`."""
+        if self._source_sel is None:
+            dset.read_direct(dest, dest_sel=dest_sel)
+        else:
+            read_HDF5_point_selection(
+                dset,
+                self._source_sel,
+                self._reorder,
+                dest,
+                dest_sel,
+            )
+
+    def get_data(self):
+        """Get the extracted data, once all increments have been read."""
+
+        data = self._data if self.incs else np.array([])
+
+        if self.is_orientation:
+            data = get_HDF5_orientation_data(data)
+
+        # transform options don't really apply to orientations
+        elif self._stacked_transforms:
+            data = apply_HDF5_transforms(data, self._stacked_transforms)
+
+        return data
+
+
+HDF5_INCREMENT_TIME_ATTR = 't/s'
+
+
+class HDF5ResultReader:
+    """Reader of incremental data from a DAMASK HDF5 file, which keeps the file open, so
+    that many quantities can be extracted without re-opening the file and re-sorting
+    the increments.
+
+    Parameters
+    ----------
+    hdf5_path : Path or str
+        Path to the HDF5 file generated by DAMASK.
+
+    Attributes
+    ----------
+    increments : list of str
+        Names of the increment groups in the file, in increment order.
+
+    """
+
+    def __init__(self, hdf5_path):
+        self.hdf5_path = hdf5_path
+        self.file = h5py.File(str(hdf5_path), 'r')
+        self.increments = get_HDF5_increment_names(self.file)
+        self._groups = {}
+        self._times = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._groups = {}
+        self.file.close()
+
+    def get_increment_group(self, inc):
+        """Get the (cached) group of an increment."""
+        if inc not in self._groups:
+            self._groups[inc] = self.file[inc]
+        return self._groups[inc]
+
+    def get_increment_time(self, inc):
+        """Get the (cached) time of an increment."""
+        if inc not in self._times:
+            attrs = self.get_increment_group(inc).attrs
+            if HDF5_INCREMENT_TIME_ATTR not in attrs:
+                msg = (f'Increment "{inc}" has no time attribute '
+                       f'("{HDF5_INCREMENT_TIME_ATTR}").')
+                raise ValueError(msg)
+            self._times[inc] = float(attrs[HDF5_INCREMENT_TIME_ATTR])
+        return self._times[inc]
+
+    def select_increments(self, increments=1, increment_range=None, time_range=None):
+        """Select increments by position, range and time, without reading any data.
+
+        Parameters
+        ----------
+        increments : int or list of int, optional
+            If an int, the increment step size. If a list, the positions of the
+            increments to select (negative positions count from the end). This is applied
+            last, to the increments within `increment_range` and `time_range`. By default,
+            1, in which case all such increments are selected.
+        increment_range : list of (int or None), optional
+            Start and stop positions (as for a `slice`) of the range of increments, in
+            increment order, from which to select.
+        time_range : list of (float or None), optional
+            Minimum and maximum time (inclusive) of the increments from which to select.
+            Times are given by the "t/s" attribute of each increment group. Only the
+            groups within `increment_range` are opened to check their time.
+
+        Returns
+        -------
+        incs : list of str
+            Names of the selected increment groups, in the order given by `increments`.
+
+        """
+
+        incs = self.increments
+        if increment_range is not None:
+            incs = incs[slice(*increment_range)]
+
+        if time_range is not None:
+            t_min, t_max = time_range
+            incs = [
+                i for i in incs
+                if (t_min is None or self.get_increment_time(i) >= t_min) and
+                (t_max is None or self.get_increment_time(i) <= t_max)
+            ]
+
+        if isinstance(increments, (int, np.integer)):
+            return incs[::increments]
+
+        try:
+            return [incs[i] for i in increments]
+        except IndexError:
+            msg = (f'Increment positions {increments} are out of range for the '
+                   f'{len(incs)} available increments.')
+            raise ValueError(msg)
+
+    def get_quantities(self, incremental_data):
+        """Extract many incremental quantities in a single pass over the increments.
+
+        Parameters
+        ----------
+        incremental_data : list of dict
+            List of dicts with the following keys:
+                path : str
+                    The HDF5 "path" to the dataset within each increment group.
+                transforms : list of dict, optional
+                    See `get_HDF5_incremental_quantity`.
+                increments : int or list of int, optional
+                    Increment step size, or positions of increments. By default, 1.
+                increment_range : list of (int or None), optional
+                    See `select_increments`.
+                time_range : list of (float or None), optional
+                    See `select_increments`.
+                points : slice, dict, list or ndarray, optional
+                    See `get_HDF5_incremental_quantity`.
+
+        Returns
+        -------
+        data : list
+            The extracted data of each quantity, as returned by
+            `get_HDF5_incremental_quantity`.
+
+        """
+
+        quantities = [
+            HDF5IncrementalQuantity(
+                dat_path=i['path'],
+                incs=self.select_increments(
+                    increments=i.get('increments', 1),
+                    increment_range=i.get('increment_range'),
+                    time_range=i.get('time_range'),
+                ),
+                transforms=i.get('transforms'),
+                points=i.get('points'),
+            )
+            for i in incremental_data
+        ]
+
+        # Read all quantities from an increment before moving on to the next:
+        inc_quantities = {}
+        for quantity in quantities:
+            for idx, inc in enumerate(quantity.incs):
+                inc_quantities.setdefault(inc, []).append((idx, quantity))
+
+        for inc in self.increments:
+            if inc in inc_quantities:
+                inc_group = self.get_increment_group(inc)
+                for idx, quantity in inc_quantities[inc]:
+                    quantity.read_increment(idx, inc_group)
+
+        return [i.get_data() for i in quantities]
+
+    def get_quantity(self, dat_path, transforms=None, increments=1, points=None,
+                     increment_range=None, time_range=None):
+        """Extract an incremental quantity. See `get_HDF5_incremental_quantity`."""
+        spec = {
+            'path': dat_path,
+            'transforms': transforms,
+            'increments': increments,
+            'points': points,
+            'increment_range': increment_range,
+            'time_range': time_range,
+        }
+        return self.get_quantities([spec])[0]
+
+
+HDF5_OPERATIONS_MANIFEST_ATTR = 'damask_parse_operations'
+
+
+def get_HDF5_operation_key(operation):
+    """Get a string that identifies an operation (as passed to `read_HDF5_file`) by its
+    name, arguments and options."""
+    op_id = {
+        'name': operation['name'],
+        'args': operation.get('args', {}),
+        'opts': operation.get('opts', {}),
+    }
+    return json.dumps(op_id, sort_keys=True, default=str)
+
+
+def get_HDF5_operations_manifest(hdf5_path):
+    """Get the keys of the operations recorded as completed on a DAMASK HDF5 file.
+
+    Parameters
+    ----------
+    hdf5_path : Path or str
+        Path to the HDF5 file generated by DAMASK.
+
+    Returns
+    -------
+    op_keys : list of str
+        Keys of the completed operations, as generated by `get_HDF5_operation_key`.
+
+    """
+    with h5py.File(str(hdf5_path), 'r') as f:
+        manifest = f.attrs.get(HDF5_OPERATIONS_MANIFEST_ATTR)
+    return json.loads(manifest) if manifest is not None else []
+
+
+def add_HDF5_operations_manifest(hdf5_path, operation):
+    """Record an operation as completed on a DAMASK HDF5 file.
+
+    Parameters
+    ----------
+    hdf5_path : Path or str
+        Path to the HDF5 file generated by DAMASK.
+    operation : dict
+        The operation, as passed to `read_HDF5_file`.
+
+    """
+    op_key = get_HDF5_operation_key(operation)
+    with h5py.File(str(hdf5_path), 'a') as f:
+        manifest = f.attrs.get(HDF5_OPERATIONS_MANIFEST_ATTR)
+        op_keys = json.loads(manifest) if manifest is not None else []
+        if op_key not in op_keys:
+            op_keys.append(op_key)
+        f.attrs[HDF5_OPERATIONS_MANIFEST_ATTR] = json.dumps(op_keys)
+
+
+def get_HDF5_incremental_quantity(hdf5_path, dat_path, transforms=None, increments=1,
+                                  points=None, increment_range=None, time_range=None):
     """Accessing HDF5 file directly, extract data defined at each increment.
 
     Parameters
@@ -512,42 +1187,48 @@ def get_HDF5_incremental_quantity(hdf5_path, dat_path, transforms=None, incremen
             sum_along_axes : int or list of int, optional
                 This uses `numpy.sum` on the data. Note that the zeroth axis is the
                 increment axis!
-    increments : int, optional
+    increments : int or list of int, optional
         Increment step size. By default, 1, in which case data for every increment will
-        be extracted.
-
-    """
-
-    with h5py.File(str(hdf5_path), 'r') as f:
-
-        incs = [i for i in f.keys() if 'inc' in i]
-        incs = sorted(incs, key=lambda i: int(re.search(r'\d+', i).group()))
-        data = np.array([f[i][dat_path][()] for i in incs])[::increments]
+        be extracted. Alternatively, a list of the positions of the increments to extract
+        (e.g. `[-1]` for the final increment). This is applied to the increments
+        selected by `increment_range` and `time_range`.
+    points : slice, dict, list or ndarray, optional
+        Selection of material points (i.e. along the zeroth axis of the dataset of each
+        increment) to extract. This may be a `slice`, a dict with (any of) the keys
+        "start", "stop" and "step", a boolean mask, or an array of point indices. The
+        extracted points are ordered as in the selection. By default, all points are
+        extracted. Note that axes of `transforms` refer to the data of the selected
+        points.
+    increment_range : list of (int or None), optional
+        Start and stop positions (as for a `slice`) of the range of increments, in
+        increment order, from which to extract data. By default, all increments.
+    time_range : list of (float or None), optional
+        Minimum and maximum time (inclusive, with None meaning unbounded) of the
+        increments from which to extract data, as given by the "t/s" attribute of each
+        increment group. By default, all increments.
 
-        # flatten structured datatype for orientations
-        if dat_path.split('/')[-1] == 'O':
-            data = data.view((data.dtype[data.dtype.names[0]], len(data.dtype)))
-
-            # cast to orientation dict
-            data = {
-                'type': 'quat',
-                'quaternions': data, # P=-1 convention
-                'unit_cell_alignment': {'x': 'a'},
-                'P': -1,
-            }
+    Notes
+    -----
+    Only the data of the selected increments (and points) is read from the file,
+    directly into the returned array. Leading transforms that do not reduce along the
+    increment axis are applied to each increment as it is read, so only one unreduced
+    increment is held in memory at a time. To process increments one at a time, see
+    `iter_HDF5_incremental_quantity`.
 
-        # transform options don't really apply to orientations
-        elif transforms:
-            for i in transforms:
-                if 'mean_along_axes' in i:
-                    data = np.mean(data, i['mean_along_axes'])
-                if 'sum_along_axes' in i:
-                    data = np.sum(data, i['sum_along_axes'])
+    """
 
-        return data
+    with HDF5ResultReader(hdf5_path) as reader:
+        return reader.get_quantity(
+            dat_path,
+            transforms,
+            increments,
+            points,
+            increment_range,
+            time_range,
+        )
 
 
-def validate_orientations(orientations):
+def validate_orientations(orientations, check_norms=True):
     """Check a set of orientations are valid, optionally with respect to a volume element.
 
     Parameters
@@ -565,6 +1246,9 @@ def validate_orientations(orientations):
                 convention (rotations are about Z, new-X, new-new-Z).
             unit_cell_alignment : dict
                 Alignment of the unit cell.
+    check_norms : bool, optional
+        If True (the default), check the quaternions are normalised, and normalise them
+        if not.
 
     Returns
     -------
@@ -622,10 +1306,11 @@ def validate_orientations(orientations):
             raise ValueError(msg)
 
     # TODO: should we check and raise if not normalised?
-    norm_factor = np.sqrt(np.sum(quaternions ** 2, axis=1))
-    if not np.allclose(norm_factor, 1):
-        print('Quaternions are not normalised; they will be normalised.')
-        quaternions = quaternions / norm_factor[:, None]
+    if check_norms:
+        norm_factor = np.sqrt(np.sum(quaternions ** 2, axis=1))
+        if not np.allclose(norm_factor, 1):
+            print('Quaternions are not normalised; they will be normalised.')
+            quaternions = quaternions / norm_factor[:, None]
 
     orientations_valid = {
         'type': 'quat',
@@ -636,18 +1321,200 @@ def validate_orientations(orientations):
     return orientations_valid
 
 
-def validate_volume_element(volume_element, phases=None, homog_schemes=None):
+VOLUME_ELEMENT_VALIDATION_LEVELS = ['structural', 'full']
+
+
+def get_label_codes(labels):
+    """Get integer codes and a table of labels from an array of labels.
+
+    Parameters
+    ----------
+    labels : ndarray of str or pandas.Categorical
+        Labels, for instance the `constituent_phase_label` or `material_homog` of a
+        volume element. If a `pandas.Categorical`, its codes and categories are used
+        directly.
+
+    Returns
+    -------
+    codes : ndarray of int
+        Index into `table` of each label.
+    table : ndarray of str
+        Distinct labels.
+
+    """
+
+    if isinstance(labels, pandas.Categorical):
+        return labels.codes, np.asarray(labels.categories, dtype=str)
+
+    table, codes = np.unique(labels, return_inverse=True)
+
+    return codes, table
+
+
+def get_unique_labels(labels):
+    """Get the labels that are present in an array of labels.
+
+    Parameters
+    ----------
+    labels : ndarray of str or pandas.Categorical
+
+    Returns
+    -------
+    ndarray of str
+
+    Notes
+    -----
+    For a `pandas.Categorical`, this counts the codes rather than comparing strings, and
+    unused categories are excluded.
+
     """
 
+    if isinstance(labels, pandas.Categorical):
+        codes, table = get_label_codes(labels)
+        return table[np.bincount(codes, minlength=table.size) > 0]
+
+    return np.unique(labels)
+
+
+def get_volume_element_fingerprint(volume_element):
+    """Get a checksum of the contents of a volume element (or of any dict of arrays and
+    other values), which changes if any of its arrays are modified."""
+
+    checksum = 0
+    for key in sorted(volume_element):
+        val = volume_element[key]
+        checksum = zlib.crc32(key.encode(), checksum)
+        if isinstance(val, dict):
+            checksum = zlib.crc32(
+                str(get_volume_element_fingerprint(val)).encode(), checksum)
+        elif isinstance(val, np.ndarray):
+            checksum = zlib.crc32(f'{val.dtype.str}{val.shape}'.encode(), checksum)
+            checksum = zlib.crc32(np.ascontiguousarray(val).view(np.uint8), checksum)
+        elif isinstance(val, pandas.Categorical):
+            codes, table = get_label_codes(val)
+            checksum = zlib.crc32(repr(table.tolist()).encode(), checksum)
+            checksum = zlib.crc32(np.ascontiguousarray(codes).view(np.uint8), checksum)
+        else:
+            checksum = zlib.crc32(repr(val).encode(), checksum)
+
+    return checksum
+
+
+class ValidatedVolumeElement(dict):
+    """A volume element dict, as returned by `validate_volume_element`, which records
+    that it has been validated.
+
+    Validation of a `ValidatedVolumeElement` by `validate_volume_element` is skipped
+    (except for the check of its labels against any specified phases and homogenization
+    schemes), if its contents have not changed since it was validated (as determined by
+    comparing a checksum of its contents) and it was validated to at least the requested
+    level.
+
     Parameters
     ----------
     volume_element : dict
+        Validated volume element.
+    level : str
+        Level of validation that has been performed; one of "structural" or "full". See
+        `validate_volume_element`.
+
+    Attributes
+    ----------
+    fingerprint : int
+        Checksum of the contents of the volume element when it was validated.
+
+    """
+
+    def __init__(self, volume_element, level):
+        super().__init__(volume_element)
+        self.level = level
+        self.fingerprint = get_volume_element_fingerprint(self)
+        self._unique_phase_labels = None
+        self._unique_homog_labels = None
+
+    @property
+    def unique_phase_labels(self):
+        """Unique values of `constituent_phase_label` (computed once)."""
+        if self._unique_phase_labels is None:
+            self._unique_phase_labels = get_unique_labels(
+                self['constituent_phase_label'])
+        return self._unique_phase_labels
+
+    @property
+    def unique_homog_labels(self):
+        """Unique values of `material_homog` (computed once)."""
+        if self._unique_homog_labels is None:
+            self._unique_homog_labels = get_unique_labels(self['material_homog'])
+        return self._unique_homog_labels
+
+    def is_validated(self, level='full'):
+        """Check if the volume element has been validated to (at least) the given level,
+        and has not been modified since."""
+        return (
+            VOLUME_ELEMENT_VALIDATION_LEVELS.index(self.level) >=
+            VOLUME_ELEMENT_VALIDATION_LEVELS.index(level) and
+            self.fingerprint == get_volume_element_fingerprint(self)
+        )
+
+    def copy(self):
+        """Get a shallow copy (in which the orientations dict is also copied)."""
+        vol_elem_copy = copy.copy(self)
+        vol_elem_copy['orientations'] = dict(self['orientations'])
+        return vol_elem_copy
+
+
+def validate_volume_element_labels(volume_element, phases=None, homog_schemes=None):
+    """Check the phase and homogenization scheme labels of a volume element are defined.
+
+    Parameters
+    ----------
+    volume_element : ValidatedVolumeElement
+    phases : dict, optional
+    homog_schemes : dict, optional
+
+    """
+
+    if homog_schemes:
+        # Check material homogenization scheme labels exist in `homog_schemes`:
+        missing = [
+            i for i in volume_element.unique_homog_labels if str(i) not in homog_schemes
+        ]
+        if missing:
+            codes, table = get_label_codes(volume_element['material_homog'])
+            mat_idx = np.flatnonzero(np.isin(table, missing)[codes])[0]
+            msg = (f'Homogenization scheme for material index {mat_idx} '
+                   f'("{table[codes[mat_idx]]}") is not present in `homog_schemes`.')
+            raise ValueError(msg)
+
+    if phases:
+        # Check constituent phase labels exist in `phases`:
+        missing = [i for i in volume_element.unique_phase_labels if str(i) not in phases]
+        if missing:
+            codes, table = get_label_codes(volume_element['constituent_phase_label'])
+            const_idx = np.flatnonzero(np.isin(table, missing)[codes])[0]
+            msg = (f'Phase for constituent index {const_idx} '
+                   f'("{table[codes[const_idx]]}") is not present in `phases`.')
+            raise ValueError(msg)
+
+
+def validate_volume_element(volume_element, phases=None, homog_schemes=None,
+                            level='full'):
+    """
+
+    Parameters
+    ----------
+    volume_element : dict or VolumeElement
     phases : dict
     homog_schemes : dict
+    level : str, optional
+        One of "structural" or "full" (the default). If "structural", the keys, shapes
+        and dtypes of the volume element are validated, but not the contents of its
+        arrays: the normalisation of the quaternions, the constituent material indices
+        and the sums of the constituent fractions are not checked.
 
     Returns
     -------
-    volume_element : dict
+    volume_element : ValidatedVolumeElement
         Dict with keys:
             constituent_material_idx : ndarray of shape (N,) of int
                 Determines the material to which each constituent belongs, where N is the
@@ -655,13 +1522,13 @@ def validate_volume_element(volume_element, phases=None, homog_schemes=None):
             constituent_material_fraction: ndarray of shape (N,) of float
                 The fraction that each constituent occupies within its respective
                 material, where N is the number of constituents.
-            constituent_phase_label : ndarray of shape (N,) of str
+            constituent_phase_label : ndarray of shape (N,) of str or pandas.Categorical
                 Determines the phase label of each constituent, where N is the number of
                 constituents.
             constituent_orientation_idx : ndarray of shape (N,) of int
                 Determines the orientation (as an index into `orientations`) associated
                 with each constituent, where N is the number of constituents.
-            material_homog : ndarray of shape (M,) of str
+            material_homog : ndarray of shape (M,) of str or pandas.Categorical
                 Determines the homogenization scheme (from a list of available
                 homogenization schemes defined elsewhere) to which each material belongs,
                 where M is the number of materials.
@@ -680,9 +1547,41 @@ def validate_volume_element(volume_element, phases=None, homog_schemes=None):
                     unit_cell_alignment : dict
                         Alignment of the unit cell.
 
+    Notes
+    -----
+    If `volume_element` is a `ValidatedVolumeElement` that has been validated to at
+    least `level`, and has not been modified since, validation is skipped, and a shallow
+    copy is returned (that shares the arrays of `volume_element`). Otherwise, the
+    returned volume element is a deep copy.
+
+    The labels `constituent_phase_label` and `material_homog` may be passed as
+    `pandas.Categorical` objects (integer codes and a small table of labels), in which
+    case they are kept as such, and the labels are checked against `phases` and
+    `homog_schemes` once per distinct label rather than once per constituent or
+    material.
+
     """
 
-    volume_element = copy.deepcopy(volume_element)
+    if isinstance(volume_element, VolumeElement):
+        volume_element = volume_element.to_dict(categorical=True)
+
+    if level not in VOLUME_ELEMENT_VALIDATION_LEVELS:
+        msg = (f'Validation `level` must be one of '
+               f'{VOLUME_ELEMENT_VALIDATION_LEVELS}, but was "{level}".')
+        raise ValueError(msg)
+
+    if (
+        isinstance(volume_element, ValidatedVolumeElement) and
+        volume_element.is_validated(level)
+    ):
+        validate_volume_element_labels(
+            volume_element,
+            phases=phases,
+            homog_schemes=homog_schemes,
+        )
+        return volume_element.copy()
+
+    volume_element = copy.deepcopy(dict(volume_element))
 
     ignore_missing_elements = False
     ignore_missing_constituents = False
@@ -737,7 +1636,10 @@ def validate_volume_element(volume_element, phases=None, homog_schemes=None):
         msg = f'The following volume element keys are unknown: {unknown_fmt}.'
         raise ValueError(msg)
 
-    orientations = validate_orientations(volume_element['orientations'])
+    orientations = validate_orientations(
+        volume_element['orientations'],
+        check_norms=(level == 'full'),
+    )
     volume_element['orientations'] = orientations
 
     if ignore_missing_constituents:
@@ -789,8 +1691,19 @@ def validate_volume_element(volume_element, phases=None, homog_schemes=None):
     num_const = None
     for key in volume_element:
 
+        # Keep categorical labels as codes and a label table:
+        if key in str_arrs and isinstance(volume_element[key], pandas.Categorical):
+            val = volume_element[key]
+            if not all(isinstance(i, str) for i in val.categories):
+                msg = (f'Volume element key "{key}" should have str categories, but has '
+                       f'categories of dtype "{val.categories.dtype}".')
+                raise TypeError(msg)
+            if val.size and val.codes.min() < 0:
+                msg = f'Volume element key "{key}" should not have missing values.'
+                raise ValueError(msg)
+
         # Convert lists to arrays and check dtypes:
-        if key in arr_keys:
+        elif key in arr_keys:
             new_val = np.array(volume_element[key])
             if key == 'element_material_idx':
                 grid_size = volume_element['grid_size']
@@ -857,27 +1770,27 @@ def validate_volume_element(volume_element, phases=None, homog_schemes=None):
     if 'constituent_material_fraction' in allowed:
 
         const_mat_idx = volume_element['constituent_material_idx']
-        validate_constituent_material_idx(const_mat_idx)
+        if level == 'full':
+            validate_constituent_material_idx(const_mat_idx)
 
         const_mat_frac = volume_element.get('constituent_material_fraction')
-        _, const_mat_idx_inv, const_mat_idx_counts = np.unique(
-            const_mat_idx,
-            return_inverse=True,
-            return_counts=True,
-        )
         if const_mat_frac is None:
             # Default is (1 / number of constituents) for each material:
-            const_mat_frac = (1 / const_mat_idx_counts)[const_mat_idx_inv]
+            const_mat_frac = (1 / np.bincount(const_mat_idx))[const_mat_idx]
             volume_element['constituent_material_fraction'] = const_mat_frac
-        else:
+        elif level == 'full':
             # Check constituent fractions sum to one within a material:
-            mat_const_idx = get_material_constituent_idx(const_mat_idx)
-            for mat_idx, mat_i_const_idx in enumerate(mat_const_idx):
-                frac_sum = np.sum(const_mat_frac[mat_i_const_idx])
-                if not np.isclose(frac_sum, 1):
-                    msg = (f'Constituent fractions must sum to one, but fractions in '
-                           f'material {mat_idx} sum to {frac_sum}.')
-                    raise ValueError(msg)
+            const_idx, mat_offsets = get_material_constituent_idx(
+                const_mat_idx,
+                return_csr=True,
+            )
+            frac_sums = np.add.reduceat(const_mat_frac[const_idx], mat_offsets[:-1])
+            bad_mat_idx = np.flatnonzero(~np.isclose(frac_sums, 1))
+            if bad_mat_idx.size:
+                mat_idx = bad_mat_idx[0]
+                msg = (f'Constituent fractions must sum to one, but fractions in '
+                       f'material {mat_idx} sum to {frac_sums[mat_idx]}.')
+                raise ValueError(msg)
 
     if 'element_material_idx' in req:
         num_elems = volume_element['element_material_idx'].size
@@ -896,23 +1809,390 @@ def validate_volume_element(volume_element, phases=None, homog_schemes=None):
                    f' does not index into `material_homog` with length {num_mats}.')
             raise ValueError(msg)
 
-    if homog_schemes:
-        # Check material homogenization scheme labels exist in `homog_schemes`:
-        for mat_idx, mat_i_homog in enumerate(volume_element['material_homog']):
-            if str(mat_i_homog) not in homog_schemes:
-                msg = (f'Homogenization scheme for material index {mat_idx} '
-                       f'("{mat_i_homog}") is not present in `homog_schemes`.')
+    volume_element = ValidatedVolumeElement(volume_element, level)
+    validate_volume_element_labels(
+        volume_element,
+        phases=phases,
+        homog_schemes=homog_schemes,
+    )
+
+    return volume_element
+
+
+class VolumeElement:
+    """A volume element whose data is stored in compact arrays, which supports amortised
+    constant-time appending of orientations and materials.
+
+    Constituent and material indices are stored as 32-bit integers, and phase and
+    homogenization scheme labels are stored as 32-bit integer codes into label tables.
+    A `VolumeElement` may be passed to any function that accepts a volume element dict;
+    use `from_dict` and `to_dict` to convert from and to a volume element dict.
+
+    The data is checked as it is set or appended, except that `element_material_idx`
+    may index materials that are yet to be added; `to_dict` raises if the volume element
+    has no materials, or if `element_material_idx` indexes materials that do not exist.
+    So that the data cannot be modified without being checked, its arrays are exposed
+    as read-only views.
+
+    Parameters
+    ----------
+    unit_cell_alignment : dict
+        Alignment of the unit cell of the orientations.
+    element_material_idx : ndarray of int, optional
+        Determines the material to which each geometric model element belongs.
+    size : list or ndarray of shape (3,) of float, optional
+    origin : list or ndarray of shape (3,) of float, optional
+
+    Attributes
+    ----------
+    phase_labels : list of str
+        Label table of the phase codes.
+    homog_labels : list of str
+        Label table of the homogenization scheme codes.
+
+    """
+
+    __slots__ = (
+        '_const_mat_idx',
+        '_const_mat_frac',
+        '_const_ori_idx',
+        '_const_phase_code',
+        '_mat_homog_code',
+        '_quats',
+        '_element_material_idx',
+        'phase_labels',
+        'homog_labels',
+        'unit_cell_alignment',
+        '_size',
+        '_origin',
+    )
+
+    def __init__(self, unit_cell_alignment, element_material_idx=None, size=None,
+                 origin=None):
+
+        self._const_mat_idx = GrowableArray(dtype=np.int32)
+        self._const_mat_frac = GrowableArray(dtype=float)
+        self._const_ori_idx = GrowableArray(dtype=np.int32)
+        self._const_phase_code = GrowableArray(dtype=np.int32)
+        self._mat_homog_code = GrowableArray(dtype=np.int32)
+        self._quats = GrowableArray(shape=(4,), dtype=float)
+        self._element_material_idx = None
+
+        self.phase_labels = []
+        self.homog_labels = []
+        self.unit_cell_alignment = unit_cell_alignment
+        self.element_material_idx = element_material_idx
+        self.size = size
+        self.origin = origin
+
+    @classmethod
+    def from_dict(cls, volume_element):
+        """Construct from a volume element dict, which is validated.
+
+        Parameters
+        ----------
+        volume_element : dict
+            Volume element that can be validated via `validate_volume_element`.
+
+        Returns
+        -------
+        volume_element : VolumeElement
+
+        """
+
+        vol_elem_dict = validate_volume_element(volume_element)
+        vol_elem = cls(
+            unit_cell_alignment=vol_elem_dict['orientations']['unit_cell_alignment'],
+            size=vol_elem_dict.get('size'),
+            origin=vol_elem_dict.get('origin'),
+        )
+
+        phase_codes, phase_labels = get_label_codes(
+            vol_elem_dict['constituent_phase_label'])
+        homog_codes, homog_labels = get_label_codes(vol_elem_dict['material_homog'])
+        vol_elem.phase_labels = phase_labels.tolist()
+        vol_elem.homog_labels = homog_labels.tolist()
+
+        vol_elem._quats.extend(vol_elem_dict['orientations']['quaternions'])
+        vol_elem._mat_homog_code.extend(homog_codes)
+        vol_elem._const_mat_idx.extend(vol_elem_dict['constituent_material_idx'])
+        vol_elem._const_mat_frac.extend(vol_elem_dict['constituent_material_fraction'])
+        vol_elem._const_ori_idx.extend(vol_elem_dict['constituent_orientation_idx'])
+        vol_elem._const_phase_code.extend(phase_codes)
+
+        if 'element_material_idx' in vol_elem_dict:
+            vol_elem.element_material_idx = vol_elem_dict['element_material_idx']
+
+        return vol_elem
+
+    def to_dict(self, categorical=False):
+        """Get the volume element as a (validated) volume element dict, whose arrays are
+        read-only views of the arrays of this object (except for the label arrays, which
+        are decoded from the label codes).
+
+        Parameters
+        ----------
+        categorical : bool, optional
+            If True, `constituent_phase_label` and `material_homog` are returned as
+            `pandas.Categorical` objects constructed from the label codes and tables,
+            instead of as decoded arrays of str. False by default.
+
+        Returns
+        -------
+        volume_element : ValidatedVolumeElement
+
+        """
+
+        self._check_materials()
+
+        vol_elem_dict = {
+            'orientations': {
+                'type': 'quat',
+                'quaternions': self.quaternions,
+                'unit_cell_alignment': self.unit_cell_alignment,
+            },
+            'constituent_material_idx': self.constituent_material_idx,
+            'constituent_material_fraction': self.constituent_material_fraction,
+            'constituent_orientation_idx': self.constituent_orientation_idx,
+        }
+        if categorical:
+            vol_elem_dict.update({
+                'constituent_phase_label': pandas.Categorical.from_codes(
+                    self.constituent_phase_code, categories=self.phase_labels),
+                'material_homog': pandas.Categorical.from_codes(
+                    self.material_homog_code, categories=self.homog_labels),
+            })
+        else:
+            vol_elem_dict.update({
+                'constituent_phase_label': self.constituent_phase_label,
+                'material_homog': self.material_homog,
+            })
+        if self.element_material_idx is not None:
+            vol_elem_dict.update({
+                'element_material_idx': self.element_material_idx,
+                'grid_size': self.grid_size,
+            })
+        for key in ['size', 'origin']:
+            if getattr(self, key) is not None:
+                vol_elem_dict[key] = getattr(self, key)
+
+        # The data of this object is kept valid as it is appended to:
+        return ValidatedVolumeElement(vol_elem_dict, level='full')
+
+    def _check_materials(self):
+        """Check the volume element has materials, and that all material indices in
+        `element_material_idx` refer to existing materials."""
+
+        if not self.num_materials:
+            raise ValueError('The volume element has no materials.')
+
+        if self.element_material_idx is not None and self.element_material_idx.size:
+            # The array from which `element_material_idx` was set may have been modified:
+            if np.min(self.element_material_idx) < 0:
+                msg = '`element_material_idx` should not contain negative indices.'
+                raise ValueError(msg)
+            max_mat_idx = int(np.max(self.element_material_idx))
+            if max_mat_idx >= self.num_materials:
+                msg = (f'Maximum material index in `element_material_idx` '
+                       f'({max_mat_idx}) does not index into the {self.num_materials} '
+                       f'materials of the volume element.')
                 raise ValueError(msg)
 
-    if phases:
-        # Check constituent phase labels exist in `phases`:
-        for const_idx, cons_i_phase in enumerate(volume_element['constituent_phase_label']):
-            if str(cons_i_phase) not in phases:
-                msg = (f'Phase for constituent index {const_idx} ("{cons_i_phase}") is '
-                       f'not present in `phases`.')
+    @property
+    def num_constituents(self):
+        return len(self._const_mat_idx)
+
+    @property
+    def num_materials(self):
+        return len(self._mat_homog_code)
+
+    @property
+    def num_orientations(self):
+        return len(self._quats)
+
+    @property
+    def quaternions(self):
+        return get_read_only_view(self._quats.array)
+
+    @property
+    def constituent_material_idx(self):
+        return get_read_only_view(self._const_mat_idx.array)
+
+    @property
+    def constituent_material_fraction(self):
+        return get_read_only_view(self._const_mat_frac.array)
+
+    @property
+    def constituent_orientation_idx(self):
+        return get_read_only_view(self._const_ori_idx.array)
+
+    @property
+    def constituent_phase_code(self):
+        return get_read_only_view(self._const_phase_code.array)
+
+    @property
+    def material_homog_code(self):
+        return get_read_only_view(self._mat_homog_code.array)
+
+    @property
+    def constituent_phase_label(self):
+        """Phase labels of the constituents, decoded from the phase codes."""
+        return np.array(self.phase_labels, dtype=str)[self.constituent_phase_code]
+
+    @property
+    def material_homog(self):
+        """Homogenization scheme labels of the materials, decoded from the codes."""
+        return np.array(self.homog_labels, dtype=str)[self.material_homog_code]
+
+    @property
+    def element_material_idx(self):
+        return self._element_material_idx
+
+    @element_material_idx.setter
+    def element_material_idx(self, element_material_idx):
+        if element_material_idx is not None:
+            element_material_idx = np.asarray(element_material_idx)
+            if element_material_idx.ndim != 3:
+                msg = (f'`element_material_idx` should be a 3D array, but has '
+                       f'{element_material_idx.ndim} dimensions.')
+                raise ValueError(msg)
+            if element_material_idx.dtype.char not in np.typecodes['AllInteger']:
+                msg = (f'`element_material_idx` should be an int array but has dtype '
+                       f'"{element_material_idx.dtype}".')
+                raise TypeError(msg)
+            if element_material_idx.size and np.min(element_material_idx) < 0:
+                msg = '`element_material_idx` should not contain negative indices.'
                 raise ValueError(msg)
+            element_material_idx = get_read_only_view(element_material_idx)
+        self._element_material_idx = element_material_idx
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, size):
+        self._size = get_volume_element_vector('size', size)
+
+    @property
+    def origin(self):
+        return self._origin
+
+    @origin.setter
+    def origin(self, origin):
+        self._origin = get_volume_element_vector('origin', origin)
+
+    @property
+    def grid_size(self):
+        if self.element_material_idx is not None:
+            return np.array(self.element_material_idx.shape)
+
+    def add_orientations(self, quaternions):
+        """Append orientations.
+
+        Parameters
+        ----------
+        quaternions : list or ndarray of shape (R, 4) of float
+            Unit quaternions, which are normalised if they are not already.
+
+        Returns
+        -------
+        orientation_idx : ndarray of shape (R,) of int
+            Indices of the new orientations.
+
+        """
+
+        quaternions = validate_orientations({
+            'type': 'quat',
+            'quaternions': np.asarray(quaternions, dtype=float).reshape(-1, 4),
+            'unit_cell_alignment': self.unit_cell_alignment,
+        })['quaternions']
+        start = self.num_orientations
+        self._quats.extend(quaternions)
+
+        return np.arange(start, self.num_orientations)
+
+    def add_material(self, homog_label, phase_labels, orientation_idx, fractions=None):
+        """Append a material.
+
+        Parameters
+        ----------
+        homog_label : str
+            Homogenization scheme label of the material.
+        phase_labels : str or list of str
+            Phase label of each constituent of the material, or a single phase label for
+            all constituents.
+        orientation_idx : list or ndarray of int
+            Orientation index of each constituent of the material.
+        fractions : list or ndarray of float, optional
+            Fraction of each constituent within the material, which must sum to one. By
+            default, constituents have equal fractions.
+
+        Returns
+        -------
+        material_idx : int
+            Index of the new material.
+
+        """
+
+        orientation_idx = np.asarray(orientation_idx, dtype=np.int32).reshape(-1)
+        num_const = orientation_idx.size
+        if isinstance(phase_labels, str):
+            phase_labels = [phase_labels] * num_const
+        if fractions is None:
+            fractions = np.full(num_const, 1 / num_const)
+        fractions = np.asarray(fractions, dtype=float).reshape(-1)
+
+        if not num_const or len(phase_labels) != num_const or fractions.size != num_const:
+            msg = ('A material must have at least one constituent, and the same number '
+                   'of phase labels, orientation indices and fractions.')
+            raise ValueError(msg)
+        if np.any((orientation_idx < 0) | (orientation_idx >= self.num_orientations)):
+            msg = (f'Orientation indices must index into the {self.num_orientations} '
+                   f'orientations of the volume element.')
+            raise ValueError(msg)
+        if not np.isclose(np.sum(fractions), 1):
+            msg = (f'Constituent fractions must sum to one, but fractions sum to '
+                   f'{np.sum(fractions)}.')
+            raise ValueError(msg)
 
-    return volume_element
+        material_idx = self.num_materials
+        self._mat_homog_code.append(get_label_code(self.homog_labels, homog_label))
+        self._const_mat_idx.extend(np.full(num_const, material_idx))
+        self._const_mat_frac.extend(fractions)
+        self._const_ori_idx.extend(orientation_idx)
+        self._const_phase_code.extend(
+            [get_label_code(self.phase_labels, i) for i in phase_labels])
+
+        return material_idx
+
+
+def get_volume_element_vector(name, vector):
+    """Check a three-vector of a volume element (i.e. its size or origin), and convert
+    it to a list of float (or None, if not specified)."""
+
+    if vector is None:
+        return None
+
+    vector_arr = np.asarray(vector)
+    if vector_arr.shape != (3,) or vector_arr.dtype.char not in (
+        np.typecodes['AllInteger'] + np.typecodes['Float']
+    ):
+        msg = (f'Volume element `{name}` should be a list or array of three numbers, '
+               f'but was: {vector!r}.')
+        raise ValueError(msg)
+
+    return vector_arr.astype(float).tolist()
+
+
+def get_label_code(labels, label):
+    """Get the code of a label in a label table, adding it to the table if necessary."""
+    label = str(label)
+    try:
+        return labels.index(label)
+    except ValueError:
+        labels.append(label)
+        return len(labels) - 1
 
 
 def validate_constituent_material_idx(constituent_material_idx):
@@ -925,8 +2205,11 @@ def validate_constituent_material_idx(constituent_material_idx):
 
     """
 
-    cmi_range = np.arange(0, np.max(constituent_material_idx) + 1)
-    if np.setdiff1d(cmi_range, constituent_material_idx).size:
+    constituent_material_idx = np.asarray(constituent_material_idx)
+    if (
+        np.min(constituent_material_idx) < 0 or
+        not np.all(np.bincount(constituent_material_idx.ravel()))
+    ):
         msg = (f'The unique values (material indices) in `constituent_material_idx` '
                f'should form an integer range. This is because the distinct materials '
                f'are defined implicitly through other index arrays in the volume '
@@ -956,7 +2239,7 @@ def validate_material_constituent_idx(material_constituent_idx):
         raise ValueError(msg)
 
 
-def get_material_constituent_idx(constituent_material_idx):
+def get_material_constituent_idx(constituent_material_idx, return_csr=False):
     """Get the index array that is the inverse of the constituent_material_idx
     index array.
 
@@ -965,20 +2248,37 @@ def get_material_constituent_idx(constituent_material_idx):
     constituent_material_idx : (list or ndarray of shape (N,)) of int
         Determines the material to which each constituent belongs, where N is the
         number of constituents.
+    return_csr : bool, optional
+        If True, return the inverse index array in compressed sparse row (CSR) form, as
+        the tuple (`constituent_idx`, `material_offsets`), rather than as a list of
+        arrays. By default, False.
 
     Returns
     -------
     material_constituent_idx : list of 1D ndarray of variable length of int
         The inverse index array to the input array. The list length will be equal to
-        the number of materials.
+        the number of materials. Only returned if `return_csr` is False.
+    constituent_idx : ndarray of shape (N,) of int
+        Constituent indices, grouped by material (and in increasing order within each
+        material). Only returned if `return_csr` is True.
+    material_offsets : ndarray of shape (M + 1,) of int
+        The constituent indices of material `i` are given by
+        `constituent_idx[material_offsets[i]:material_offsets[i + 1]]`, where M is the
+        number of materials. Only returned if `return_csr` is True.
 
     """
 
     validate_constituent_material_idx(constituent_material_idx)
-    material_constituent_idx = []
-    for mat_idx in np.unique(constituent_material_idx):
-        mat_const_idx_i = np.where(np.isin(constituent_material_idx, mat_idx))[0]
-        material_constituent_idx.append(mat_const_idx_i)
+
+    constituent_material_idx = np.asarray(constituent_material_idx)
+    constituent_idx = np.argsort(constituent_material_idx, kind='stable')
+    material_offsets = np.zeros(np.max(constituent_material_idx) + 2, dtype=int)
+    np.cumsum(np.bincount(constituent_material_idx), out=material_offsets[1:])
+
+    if return_csr:
+        return constituent_idx, material_offsets
+
+    material_constituent_idx = np.split(constituent_idx, material_offsets[1:-1])
 
     return material_constituent_idx
 
@@ -1013,9 +2313,17 @@ def get_constituent_material_idx(material_constituent_idx):
     return constituent_material_idx
 
 
-def get_volume_element_materials(volume_element, homog_schemes=None, phases=None):
-    """Get the materials list from a volume element that can be used to populate
-    the "microstructures" list in a DAMASK materials.yaml file.
+def get_material_sidecar_path(mat_path):
+    """Get the path of the binary sidecar file of a DAMASK material.yaml file, which
+    contains the data of its "microstructure" section as arrays."""
+    mat_path = Path(mat_path)
+    return mat_path.with_name(mat_path.name + '.npz')
+
+
+def get_volume_element_material_data(volume_element, homog_schemes=None, phases=None):
+    """Get the data of the materials of a volume element, as arrays over all
+    constituents, from which the "microstructures" list in a DAMASK materials.yaml file
+    can be generated.
 
     Parameters
     ----------
@@ -1023,7 +2331,20 @@ def get_volume_element_materials(volume_element, homog_schemes=None, phases=None
 
     Returns
     -------
-    materials : list of dict
+    material_data : dict
+        Dict with the following keys:
+            material_constituent_idx : list of ndarray of int
+                The constituent indices of each material.
+            constituent_fraction : ndarray of shape (N,) of float
+            constituent_orientation : ndarray of shape (N, 4) of float
+                Quaternions of each constituent, converted to the DAMASK-compatible unit
+                cell alignment for hexagonal phases.
+            constituent_phase_code : ndarray of shape (N,) of int
+                Index into `phase_labels` of the phase of each constituent.
+            phase_labels : list of str
+            material_homog_code : ndarray of shape (M,) of int
+                Index into `homog_labels` of the homogenization scheme of each material.
+            homog_labels : list of str
 
     """
 
@@ -1037,62 +2358,199 @@ def get_volume_element_materials(volume_element, homog_schemes=None, phases=None
     mat_const_idx = get_material_constituent_idx(const_mat_idx)
 
     all_quats = volume_element['orientations']['quaternions']
-    const_mat_frac = volume_element['constituent_material_fraction']
     const_ori_idx = volume_element['constituent_orientation_idx']
-    const_phase_lab = volume_element['constituent_phase_label']
+    const_quats = np.asarray(all_quats, dtype=float)[const_ori_idx]
 
-    materials = []
-    for mat_idx, mat_i_const_idx in enumerate(mat_const_idx):
+    # Encode labels as integer codes into small label tables:
+    phase_codes, phase_labels = get_label_codes(volume_element['constituent_phase_label'])
+    homog_codes, homog_labels = get_label_codes(volume_element['material_homog'])
 
-        mat_i_constituents = []
-        for const_idx in mat_i_const_idx:
-            mat_i_const_j_phase = str(const_phase_lab[const_idx])
-            mat_i_const_j_ori = [float(i) for i in all_quats[const_ori_idx[const_idx]]]
+    # Look up the lattice of each distinct phase label only once (a categorical label
+    # table may include unused labels, which need not be present in `phases`):
+    is_hex = np.array([
+        i in phases and phases[i]['lattice'] == 'hex' for i in phase_labels.tolist()
+    ], dtype=bool)
+    const_is_hex = is_hex[phase_codes]
 
-            if phases[mat_i_const_j_phase]['lattice'] == 'hex':
+    if np.any(const_is_hex):
 
-                if 'unit_cell_alignment' not in volume_element['orientations']:
-                    msg = 'Orientation `unit_cell_alignment` must be specified.'
-                    raise ValueError(msg)
+        if 'unit_cell_alignment' not in volume_element['orientations']:
+            msg = 'Orientation `unit_cell_alignment` must be specified.'
+            raise ValueError(msg)
 
-                if volume_element['orientations']['unit_cell_alignment'].get('y') == 'b':
-                    # Convert from y//b to x//a:
-                    hex_transform_quat = axang2quat(np.array([0, 0, 1]), -np.pi/6)
-                    mat_i_const_j_ori = multiply_quaternions(
-                        hex_transform_quat,
-                        np.array(mat_i_const_j_ori)
-                    ).tolist()
-
-                elif volume_element['orientations']['unit_cell_alignment'].get('x') != 'a':
-                    msg = (f'Cannot convert from the following specified unit cell '
-                           f'alignment to DAMASK-compatible unit cell alignment (x//a): '
-                           f'{volume_element["orientations"]["unit_cell_alignment"]}')
-                    NotImplementedError(msg)
-
-            mat_i_const_j = {
-                'fraction': float(const_mat_frac[const_idx]),
-                'orientation': mat_i_const_j_ori,
-                'phase': mat_i_const_j_phase,
-            }
-            mat_i_constituents.append(mat_i_const_j)
-
-        materials.append({
-            'homogenization': str(volume_element['material_homog'][mat_idx]),
-            'constituents': mat_i_constituents,
-        })
+        if volume_element['orientations']['unit_cell_alignment'].get('y') == 'b':
+            # Convert from y//b to x//a, for all hexagonal constituents at once:
+            hex_transform_quat = axang2quat(np.array([0, 0, 1]), -np.pi/6)
+            const_quats[const_is_hex] = multiply_quaternions(
+                hex_transform_quat,
+                const_quats[const_is_hex],
+            )
+
+        elif volume_element['orientations']['unit_cell_alignment'].get('x') != 'a':
+            msg = (f'Cannot convert from the following specified unit cell '
+                   f'alignment to DAMASK-compatible unit cell alignment (x//a): '
+                   f'{volume_element["orientations"]["unit_cell_alignment"]}')
+            raise NotImplementedError(msg)
+
+    material_data = {
+        'material_constituent_idx': mat_const_idx,
+        'constituent_fraction': np.asarray(
+            volume_element['constituent_material_fraction'],
+            dtype=float,
+        ),
+        'constituent_orientation': const_quats,
+        'constituent_phase_code': phase_codes,
+        'phase_labels': phase_labels.tolist(),
+        'material_homog_code': homog_codes,
+        'homog_labels': homog_labels.tolist(),
+    }
+
+    return material_data
+
+
+def get_volume_element_materials(volume_element, homog_schemes=None, phases=None):
+    """Get the materials list from a volume element that can be used to populate
+    the "microstructures" list in a DAMASK materials.yaml file.
+
+    Parameters
+    ----------
+    volume_element : dict
+
+    Returns
+    -------
+    materials : list of dict
+
+    """
+
+    material_data = get_volume_element_material_data(
+        volume_element,
+        homog_schemes=homog_schemes,
+        phases=phases,
+    )
+
+    const_frac = material_data['constituent_fraction'].tolist()
+    const_ori = material_data['constituent_orientation'].tolist()
+    phase_labels = material_data['phase_labels']
+    homog_labels = material_data['homog_labels']
+    const_phase_code = material_data['constituent_phase_code'].tolist()
+
+    materials = [
+        {
+            'homogenization': homog_labels[mat_homog_code],
+            'constituents': [
+                {
+                    'fraction': const_frac[const_idx],
+                    'orientation': const_ori[const_idx],
+                    'phase': phase_labels[const_phase_code[const_idx]],
+                }
+                for const_idx in mat_i_const_idx.tolist()
+            ],
+        }
+        for mat_homog_code, mat_i_const_idx in zip(
+            material_data['material_homog_code'].tolist(),
+            material_data['material_constituent_idx'],
+        )
+    ]
 
     return materials
 
 
-def validate_element_material_idx(element_material_idx):
-    num_mats = np.max(element_material_idx) + 1
-    emi_range = np.arange(0, num_mats)
-    set_diff = np.setdiff1d(emi_range, element_material_idx)
-    if set_diff.size:
+ELEMENT_MATERIAL_IDX_DTYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def get_element_material_idx_dtype(num_mats, dtype=None):
+    """Get the smallest signed integer dtype that can store an `element_material_idx`
+    array with a given number of materials.
+
+    Parameters
+    ----------
+    num_mats : int
+        Number of materials indexed by the `element_material_idx` array.
+    dtype : dtype-like, optional
+        If specified, this integer dtype is used instead (for instance, `np.int64`).
+
+    Returns
+    -------
+    numpy.dtype
+
+    Notes
+    -----
+    The dtype can also represent `num_mats` itself, so the one-indexed material indices
+    (as written to a geometry file) can be computed without overflow.
+
+    """
+
+    if dtype is not None:
+        dtype = np.dtype(dtype)
+        if dtype.kind not in 'iu':
+            msg = f'`element_material_idx` dtype must be an integer dtype, not "{dtype}".'
+            raise TypeError(msg)
+        return dtype
+
+    for int_dtype in ELEMENT_MATERIAL_IDX_DTYPES:
+        if num_mats <= np.iinfo(int_dtype).max:
+            return np.dtype(int_dtype)
+
+    msg = f'Too many materials ({num_mats}) for an `element_material_idx` array.'
+    raise ValueError(msg)
+
+
+ELEMENT_MATERIAL_IDX_COUNT_CHUNK = 2 ** 22
+
+
+def validate_element_material_idx(element_material_idx, return_counts=False):
+    """Check that the material indices of an `element_material_idx` array form an integer
+    range starting from zero.
+
+    Parameters
+    ----------
+    element_material_idx : ndarray of int
+    return_counts : bool, optional
+        If True, also return the number of elements of each material. False by default.
+
+    Returns
+    -------
+    num_mats : int
+        Number of materials.
+    material_num_elements : ndarray of shape (num_mats,) of int
+        Number of elements of each material. Only returned if `return_counts` is True.
+
+    Notes
+    -----
+    The elements of each material are counted with `numpy.bincount` (in chunks, to limit
+    the size of the intermediate array of indices that it generates), so the check scales
+    linearly with the number of elements.
+
+    """
+
+    element_material_idx = np.asarray(element_material_idx)
+    flat_idx = element_material_idx.ravel(order='K')
+
+    min_idx = int(np.min(flat_idx))
+    if min_idx < 0:
+        msg = (f'The values (material indices) in `element_material_idx` should be '
+               f'non-negative, but the minimum value is {min_idx}.')
+        raise ValueError(msg)
+
+    # Use a Python int, which cannot overflow for compact dtypes:
+    num_mats = int(np.max(flat_idx)) + 1
+    chunk_size = max(ELEMENT_MATERIAL_IDX_COUNT_CHUNK, num_mats)
+    material_num_elements = np.zeros(num_mats, dtype=np.int64)
+    for start in range(0, flat_idx.size, chunk_size):
+        material_num_elements += np.bincount(
+            flat_idx[start:start + chunk_size],
+            minlength=num_mats,
+        )
+
+    missing = np.flatnonzero(material_num_elements == 0)
+    if missing.size:
         msg = (f'The unique values (material indices) in `element_material_idx` '
                f'should form an integer range. This is because the distinct '
                f'materials are defined implicitly through other index arrays in the '
-               f'volume element. Found missing material indices:\n{set_diff}')
+               f'volume element. Found missing material indices:\n{missing}')
         raise ValueError(msg)
 
+    if return_counts:
+        return num_mats, material_num_elements
+
     return num_mats
@@ -1,17 +1,23 @@
 """`damask_parse.writers.py`"""
 
 import copy
+import json
 from pathlib import Path
 from collections import OrderedDict
 
+import h5py
 import numpy as np
 from ruamel.yaml import YAML
 
 from damask_parse.utils import (
     zeropad,
     format_1D_masked_array,
+    format_yaml_float,
+    format_yaml_str,
+    get_element_material_idx_dtype,
     align_orientations,
-    get_volume_element_materials,
+    get_material_sidecar_path,
+    get_volume_element_material_data,
     validate_volume_element,
 )
 
@@ -20,10 +26,76 @@ __all__ = [
     'write_material',
     'write_numerics',
     'write_load_case',
+    'write_spectral_results',
+    'write_volume_element_response',
 ]
 
+# Approximate maximum size in bytes of each chunk of the datasets written by
+# `write_volume_element_response`:
+RESPONSE_CHUNK_BYTES = 2 ** 20
+RESPONSE_MIN_CHUNK_BYTES = 2 ** 16
 
-def write_geom(volume_element, geom_path):
+
+def compress_geom_voxels(element_material_idx):
+    """Generate the lines of a run-length compressed geometry file voxel block.
+
+    Parameters
+    ----------
+    element_material_idx : ndarray of shape equal to `grid_size` of int
+        Determines the material to which each geometric model element belongs. Material
+        indices are written as they are passed (i.e. they should be one-indexed).
+
+    Yields
+    ------
+    line : str
+        A line of the form "N of M" (N repetitions of the material index M), "a to b"
+        (the material indices from a to b inclusive, with a step of plus or minus one)
+        or "M" (a single material index M), excluding the new line character.
+
+    Notes
+    -----
+    This follows the compression scheme used by the DAMASK `geom_pack` command.
+
+    """
+
+    # Order elements as they appear in the geometry file (x varies fastest):
+    elems = element_material_idx.ravel(order='F')
+
+    # Find runs of repeated values:
+    run_starts = np.concatenate([[0], np.flatnonzero(np.diff(elems)) + 1])
+    run_lengths = np.diff(np.append(run_starts, elems.size)).tolist()
+    run_values = elems[run_starts].tolist()
+
+    num_runs = len(run_values)
+    run_idx = 0
+    while run_idx < num_runs:
+
+        value = run_values[run_idx]
+        if run_lengths[run_idx] > 1:
+            yield f'{run_lengths[run_idx]} of {value}'
+            run_idx += 1
+            continue
+
+        # Extend a sequence of single values that increase or decrease by one:
+        seq_end = run_idx
+        if run_idx + 1 < num_runs and run_lengths[run_idx + 1] == 1:
+            step = run_values[run_idx + 1] - value
+            if abs(step) == 1:
+                while (
+                    seq_end + 1 < num_runs and
+                    run_lengths[seq_end + 1] == 1 and
+                    run_values[seq_end + 1] - run_values[seq_end] == step
+                ):
+                    seq_end += 1
+
+        if seq_end > run_idx:
+            yield f'{value} to {run_values[seq_end]}'
+        else:
+            yield f'{value}'
+        run_idx = seq_end + 1
+
+
+def write_geom(volume_element, geom_path, compress=False):
     """Write the geometry file for a spectral DAMASK simulation.
 
     Parameters
@@ -41,6 +113,10 @@ def write_geom(volume_element, geom_path):
                 Volume element origin. By default: [0, 0, 0].
     geom_path : str or Path
         The path to the file that will be generated.
+    compress : bool, optional
+        If True, write the material indices using the run-length compressed syntax
+        ("N of M" and "a to b") used by the DAMASK `geom_pack` command. By default,
+        False.
 
     Returns
     -------
@@ -60,7 +136,15 @@ def write_geom(volume_element, geom_path):
     grid_size = element_material_idx.shape
     ve_size = volume_element.get('size') or [1.0, 1.0, 1.0]
     ve_origin = volume_element.get('origin') or [0.0, 0.0, 0.0]
-    num_micros = np.max(element_material_idx) + 1  # element_material_idx is zero-indexed
+    num_micros = int(np.max(element_material_idx)) + 1  # zero-indexed
+    # Ensure the one-indexed material indices can be computed without overflow:
+    element_material_idx = element_material_idx.astype(
+        np.promote_types(
+            element_material_idx.dtype,
+            get_element_material_idx_dtype(num_micros),
+        ),
+        copy=False,
+    )
 
     header_lns = [
         f'grid a {grid_size[0]} b {grid_size[1]} c {grid_size[2]}',
@@ -72,18 +156,21 @@ def write_geom(volume_element, geom_path):
     num_header_lns = len(header_lns)
     header = f'{num_header_lns} header\n' + '\n'.join(header_lns) + '\n'
 
-    elem_mat_idx_2D = np.concatenate(element_material_idx.swapaxes(0, 2))
-    elem_mat_idx_2D += 1  # one-indexed
+    geom_path = Path(geom_path)
 
-    arr_str = ''
-    for row in elem_mat_idx_2D:
-        for col in row:
-            arr_str += '{:<5d}'.format(col)
-        arr_str += '\n'
+    if compress:
+        with geom_path.open('w') as handle:
+            handle.write(header)
+            for ln in compress_geom_voxels(element_material_idx + 1):  # one-indexed
+                handle.write(ln + '\n')
+        return geom_path
 
-    geom_path = Path(geom_path)
     with geom_path.open('w') as handle:
-        handle.write(header + arr_str)
+        handle.write(header)
+        # Write one z-slab at a time, where each row in the file is a row along x:
+        for z_idx in range(grid_size[2]):
+            slab = element_material_idx[:, :, z_idx].T + 1  # one-indexed
+            np.savetxt(handle, slab, fmt='%-5d', delimiter='')
 
     return geom_path
 
@@ -204,7 +291,104 @@ def write_load_case(load_path, load_cases):
     return load_path
 
 
-def write_material(homog_schemes, phases, volume_element, dir_path, name='material.yaml'):
+def iter_microstructure_lines(material_data):
+    """Generate the lines of the "microstructure" section of a DAMASK material.yaml file.
+
+    Parameters
+    ----------
+    material_data : dict
+        As returned by `utils.get_volume_element_material_data`.
+
+    Yields
+    ------
+    line : str
+
+    Notes
+    -----
+    This is equivalent to, but much faster than, dumping the list returned by
+    `utils.get_volume_element_materials` with `ruamel.yaml`, except that orientations
+    are emitted as flow sequences.
+
+    """
+
+    mat_const_idx = material_data['material_constituent_idx']
+    if not mat_const_idx:
+        yield 'microstructure: []\n'
+        return
+
+    const_frac = material_data['constituent_fraction']
+    const_ori = material_data['constituent_orientation']
+
+    if np.all(np.isfinite(const_frac)) and np.all(np.isfinite(const_ori)):
+        # The `str` of a list of finite Python floats is a valid YAML flow sequence:
+        frac_strs = [repr(i) for i in const_frac.tolist()]
+        ori_strs = [str(i) for i in const_ori.tolist()]
+    else:
+        frac_strs = [format_yaml_float(i) for i in const_frac.tolist()]
+        ori_strs = [
+            '[' + ', '.join(format_yaml_float(j) for j in i) + ']'
+            for i in const_ori.tolist()
+        ]
+
+    # Format each distinct label only once:
+    phase_strs = [format_yaml_str(i) for i in material_data['phase_labels']]
+    homog_strs = [format_yaml_str(i) for i in material_data['homog_labels']]
+    const_phase_strs = [
+        phase_strs[i] for i in material_data['constituent_phase_code'].tolist()
+    ]
+    mat_homog_strs = [homog_strs[i] for i in material_data['material_homog_code'].tolist()]
+
+    yield 'microstructure:\n'
+    for mat_homog_str, mat_i_const_idx in zip(mat_homog_strs, mat_const_idx):
+        yield f'- homogenization: {mat_homog_str}\n'
+        if not len(mat_i_const_idx):
+            yield '  constituents: []\n'
+            continue
+        yield '  constituents:\n'
+        for const_idx in mat_i_const_idx.tolist():
+            yield (
+                f'  - fraction: {frac_strs[const_idx]}\n'
+                f'    orientation: {ori_strs[const_idx]}\n'
+                f'    phase: {const_phase_strs[const_idx]}\n'
+            )
+
+
+def write_material_sidecar(material_data, path):
+    """Write the data of the microstructure section of a material file to a binary
+    (NumPy npz) file, in the order in which it is written to the material file.
+
+    Parameters
+    ----------
+    material_data : dict
+        As returned by `utils.get_volume_element_material_data`.
+    path : str or Path
+        Path of the npz file to write.
+
+    """
+
+    mat_const_idx = material_data['material_constituent_idx']
+    num_mat_consts = np.array([len(i) for i in mat_const_idx], dtype=int)
+    const_order = (np.concatenate(mat_const_idx).astype(int) if mat_const_idx
+                   else np.array([], dtype=int))
+
+    # Write to a file handle, so that NumPy does not append an ".npz" extension:
+    with Path(path).open('wb') as handle:
+        np.savez(
+            handle,
+            homog_labels=np.array(material_data['homog_labels'], dtype=str),
+            material_homog_code=material_data['material_homog_code'],
+            constituent_material_idx=np.repeat(np.arange(len(mat_const_idx)),
+                                               num_mat_consts),
+            constituent_material_fraction=material_data['constituent_fraction'][
+                const_order],
+            phase_labels=np.array(material_data['phase_labels'], dtype=str),
+            constituent_phase_code=material_data['constituent_phase_code'][const_order],
+            quaternions=material_data['constituent_orientation'][const_order],
+        )
+
+
+def write_material(homog_schemes, phases, volume_element, dir_path, name='material.yaml',
+                   sidecar=False):
     """Write the material.yaml file for a DAMASK simulation.
 
     Parameters
@@ -280,6 +464,11 @@ def write_material(homog_schemes, phases, volume_element, dir_path, name='materi
         Directory in which to generate the material.yaml file.
     name : str, optional
         Name of material file to write. By default, set to "material.yaml".
+    sidecar : bool, optional
+        If True, also write the data of the "microstructure" section as arrays to a
+        binary (NumPy npz) sidecar file (named by appending ".npz" to the material file
+        name), which is used by `readers.read_material`, in preference to the material
+        file, while it is newer than the material file. By default, False.
 
     Returns
     -------
@@ -304,7 +493,7 @@ def write_material(homog_schemes, phases, volume_element, dir_path, name='materi
 
     """
 
-    microstructures = get_volume_element_materials(
+    material_data = get_volume_element_material_data(
         volume_element,
         homog_schemes=homog_schemes,
         phases=phases,
@@ -312,13 +501,23 @@ def write_material(homog_schemes, phases, volume_element, dir_path, name='materi
     mat_dat = {
         'phase': phases,
         'homogenization': homog_schemes,
-        'microstructure': microstructures,
     }
 
     dir_path = Path(dir_path).resolve()
     mat_path = dir_path.joinpath(name)
     yaml = YAML()
-    yaml.dump(mat_dat, mat_path)
+    with mat_path.open('w', encoding='utf-8') as handle:
+        yaml.dump(mat_dat, handle)
+        # The (potentially very long) microstructure section is emitted directly:
+        handle.writelines(iter_microstructure_lines(material_data))
+
+    sidecar_path = get_material_sidecar_path(mat_path)
+    if sidecar:
+        # Written after the material file, so it is newer:
+        write_material_sidecar(material_data, sidecar_path)
+    elif sidecar_path.exists():
+        # Remove any sidecar of a previous material file:
+        sidecar_path.unlink()
 
     return mat_path
 
@@ -348,3 +547,185 @@ def write_numerics(dir_path, numerics, name='numerics.yaml'):
     yaml.dump(numerics, numerics_path)
 
     return numerics_path
+
+
+def write_spectral_results(results, path, kind='stdout'):
+    """Write the parsed data of many spectral solver output files to one HDF5 file.
+
+    Parameters
+    ----------
+    results : dict
+        Parsed data, as returned by `readers.read_spectral_files`.
+    path : str or Path
+        Path of the HDF5 file to generate.
+    kind : str, optional
+        One of "stdout" or "stderr", indicating the type of parsed data. By default,
+        "stdout".
+
+    Returns
+    -------
+    path : Path
+        Path of the generated HDF5 file.
+
+    Notes
+    -----
+    Each file is written to a group named by its position in `results`, which has the
+    attributes "path" and, if parsing failed, "error". Within each group, arrays are
+    written as datasets (with the convergence error dicts as sub-groups), and warnings
+    or errors are written as "code" and "message" datasets within a "warnings" or
+    "errors" sub-group.
+
+    """
+
+    str_dtype = h5py.string_dtype()
+    msgs_name = 'warnings' if kind == 'stdout' else 'errors'
+
+    path = Path(path)
+    with h5py.File(str(path), 'w') as f:
+        for file_idx, (file_path, result) in enumerate(results.items()):
+
+            group = f.create_group(str(file_idx))
+            group.attrs['path'] = file_path
+            if result['error'] is not None:
+                group.attrs['error'] = result['error']
+                continue
+
+            data = result['data']
+            msgs = data.get('warnings', []) if kind == 'stdout' else data
+            msgs_group = group.create_group(msgs_name)
+            msgs_group.create_dataset('code', data=np.array(
+                [i['code'] for i in msgs], dtype=int))
+            msgs_group.create_dataset('message', data=np.array(
+                [i['message'] for i in msgs], dtype=object), dtype=str_dtype)
+
+            if kind == 'stdout':
+                for key, val in data.items():
+                    if key == 'warnings':
+                        continue
+                    if isinstance(val, dict):
+                        sub_group = group.create_group(key)
+                        for sub_key, sub_val in val.items():
+                            sub_group.create_dataset(sub_key, data=sub_val)
+                    else:
+                        group.create_dataset(key, data=val)
+
+    return path
+
+
+def encode_response_meta(obj):
+    """Encode objects within the metadata of a volume element response that are not
+    JSON-serialisable (for use as the `default` of `json.dumps`)."""
+    if isinstance(obj, slice):
+        return {'start': obj.start, 'stop': obj.stop, 'step': obj.step}
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    return str(obj)
+
+
+def get_response_chunks(shape, itemsize):
+    """Get the chunk shape of a volume element response dataset, where each chunk
+    contains (part of) the data of a single increment, or, if the data of a single
+    increment is small, the data of several consecutive increments."""
+
+    chunks = [1] + list(shape[1:])
+    # Split along the next largest axis until the chunk is small enough:
+    while len(chunks) > 1 and np.prod(chunks) * itemsize > RESPONSE_CHUNK_BYTES:
+        axis = int(np.argmax(chunks[1:])) + 1
+        if chunks[axis] == 1:
+            break
+        chunks[axis] = int(np.ceil(chunks[axis] / 2))
+
+    # Group small increments, so that chunks are large enough to compress well:
+    chunk_bytes = int(np.prod(chunks)) * itemsize
+    if chunk_bytes < RESPONSE_MIN_CHUNK_BYTES:
+        chunks[0] = min(shape[0], int(np.ceil(RESPONSE_MIN_CHUNK_BYTES / chunk_bytes)))
+
+    return tuple(chunks)
+
+
+def write_response_array(group, name, data, compression, compression_opts):
+    """Write an array of a volume element response as a chunked, compressed dataset."""
+
+    if data.ndim == 0 or data.size == 0:
+        # Scalar and empty datasets cannot be chunked:
+        return group.create_dataset(name, data=data)
+
+    return group.create_dataset(
+        name,
+        data=data,
+        chunks=get_response_chunks(data.shape, data.dtype.itemsize),
+        compression=compression,
+        compression_opts=compression_opts,
+        shuffle=compression is not None,
+    )
+
+
+def write_volume_element_response(volume_element_response, path, compression='gzip',
+                                  compression_opts=4):
+    """Write extracted volume element response data to a chunked, compressed HDF5 file.
+
+    Parameters
+    ----------
+    volume_element_response : dict
+        Extracted data, as returned by `readers.read_HDF5_file` (or the
+        "volume_element_response" item of the dict returned by `readers.read_HDF5_files`).
+    path : str or Path
+        Path of the HDF5 file to generate.
+    compression : str, optional
+        HDF5 compression filter. By default, "gzip". If None, data is not compressed.
+    compression_opts : int, optional
+        Compression filter options; for "gzip", the compression level. By default, 4.
+
+    Returns
+    -------
+    path : Path
+        Path of the generated HDF5 file.
+
+    Notes
+    -----
+    Each quantity is written to a group, which has the attribute "meta" (the JSON-encoded
+    metadata). Array data is written to a "data" dataset, chunked so that each chunk
+    contains (part of) the data of a single increment, or the data of several consecutive
+    increments if the data of each increment is small. Dict data (e.g. orientations) and
+    list data (e.g. data of differing shapes from multiple files) are written to a "data"
+    sub-group, with an attribute "kind" of "dict" or "list". For dict data, non-array
+    items are JSON-encoded in the attribute "items". This file may be read lazily using
+    `readers.read_volume_element_response`.
+
+    """
+
+    path = Path(path)
+    with h5py.File(str(path), 'w') as f:
+        for name, response in volume_element_response.items():
+
+            group = f.create_group(name)
+            group.attrs['meta'] = json.dumps(
+                response.get('meta', {}),
+                default=encode_response_meta,
+            )
+
+            data = response['data']
+            if isinstance(data, dict):
+                data_group = group.create_group('data')
+                data_group.attrs['kind'] = 'dict'
+                items = {}
+                for key, val in data.items():
+                    if isinstance(val, np.ndarray):
+                        write_response_array(
+                            data_group, key, val, compression, compression_opts)
+                    else:
+                        items[key] = val
+                data_group.attrs['items'] = json.dumps(items, default=encode_response_meta)
+
+            elif isinstance(data, list):
+                data_group = group.create_group('data')
+                data_group.attrs['kind'] = 'list'
+                for idx, val in enumerate(data):
+                    write_response_array(
+                        data_group, str(idx), np.asarray(val), compression, compression_opts)
+
+            else:
+                write_response_array(
+                    group, 'data', np.asarray(data), compression, compression_opts)
+
+    return path
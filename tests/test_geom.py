@@ -6,11 +6,18 @@ used for spectral simulations in DAMASK.
 """
 
 from unittest import TestCase
+from pathlib import Path
+import json
+import os
+import tempfile
 
 import numpy as np
 
+from damask_parse.readers import read_geom, decode_geom_voxels, get_geom_cache_dir
+from damask_parse.writers import write_geom
 from damask_parse.utils import (
-    check_volume_elements_equal, validate_volume_element_OLD
+    check_volume_elements_equal, validate_volume_element_OLD,
+    validate_element_material_idx,
 )
 
 
@@ -70,3 +77,180 @@ class VolumeElementTestCase(TestCase):
         }
 
         self.assertFalse(check_volume_elements_equal(vol_elem_a, vol_elem_b))
+
+
+class GeomFileTestCase(TestCase):
+    """Tests on reading and writing geometry files."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.geom_path = Path(self.tmp_dir.name).joinpath('geom.geom')
+
+        grid_size = (7, 5, 3)
+        element_material_idx = np.random.randint(0, 20, grid_size)
+        element_material_idx.flat[:20] = np.arange(20)
+        self.element_material_idx = element_material_idx
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_volume_element(self):
+        num_mats = np.max(self.element_material_idx) + 1
+        volume_element = {
+            'element_material_idx': self.element_material_idx,
+            'grid_size': self.element_material_idx.shape,
+            'orientations': {
+                'type': 'quat',
+                'quaternions': np.tile([1.0, 0.0, 0.0, 0.0], (num_mats, 1)),
+                'unit_cell_alignment': {'x': 'a'},
+            },
+            'phase_labels': ['Al'],
+            'homog_label': 'SX',
+        }
+        return volume_element
+
+    def write_plain_geom(self):
+        """Write `element_material_idx` in the uncompressed geometry file format."""
+        header_lns = [
+            'grid a 7 b 5 c 3',
+            'size x 1.0 y 1.0 z 1.0',
+            'origin x 0.0 y 0.0 z 0.0',
+            'homogenization 1',
+        ]
+        rows = np.concatenate(self.element_material_idx.swapaxes(0, 2)) + 1
+        with self.geom_path.open('w') as handle:
+            handle.write(f'{len(header_lns)} header\n' + '\n'.join(header_lns) + '\n')
+            for row in rows:
+                handle.write(''.join(['{:<5d}'.format(i) for i in row]) + '\n')
+
+    def test_read_geom_element_material_idx(self):
+        """Test `read_geom` recovers the zero-indexed `element_material_idx`."""
+        self.write_plain_geom()
+        geom = read_geom(self.geom_path)
+        self.assertEqual(geom['grid_size'], [7, 5, 3])
+        self.assertTrue(np.array_equal(
+            geom['element_material_idx'],
+            self.element_material_idx,
+        ))
+
+    def test_read_geom_material_num_elements(self):
+        """Test `read_geom` returns the number of voxels of each material."""
+        self.write_plain_geom()
+        for _ in range(2):  # parsed, then loaded from the cache
+            geom = read_geom(self.geom_path, cache=True)
+            self.assertTrue(np.array_equal(
+                geom['material_num_elements'],
+                np.bincount(self.element_material_idx.ravel()),
+            ))
+
+    def test_validate_element_material_idx(self):
+        num_mats, counts = validate_element_material_idx(
+            self.element_material_idx.swapaxes(0, 2).astype(np.int8),
+            return_counts=True,
+        )
+        self.assertEqual(num_mats, 20)
+        self.assertEqual(counts.sum(), self.element_material_idx.size)
+        for bad_value in [-1, 20]:
+            emi = self.element_material_idx.copy()
+            emi[emi == 5] = bad_value
+            with self.assertRaises(ValueError):
+                validate_element_material_idx(emi)
+
+    def test_read_geom_dtype(self):
+        """Test `read_geom` uses the smallest integer dtype, unless overridden."""
+        self.write_plain_geom()
+        self.assertEqual(read_geom(self.geom_path)['element_material_idx'].dtype, np.int8)
+        geom = read_geom(self.geom_path, dtype=np.int64)
+        self.assertEqual(geom['element_material_idx'].dtype, np.int64)
+        self.assertTrue(np.array_equal(
+            geom['element_material_idx'],
+            self.element_material_idx,
+        ))
+
+    def test_read_geom_wrong_voxel_count(self):
+        """Test error raised if the number of voxels does not match the grid size."""
+        self.write_plain_geom()
+        with self.geom_path.open('a') as handle:
+            handle.write('1\n')
+        with self.assertRaises(ValueError):
+            read_geom(self.geom_path)
+
+    def test_write_geom_voxel_format(self):
+        """Test `write_geom` writes voxels with the fixed-width format."""
+        self.write_plain_geom()
+        expected = self.geom_path.read_text().splitlines()[5:]
+        write_geom(self.get_volume_element(), self.geom_path)
+        self.assertEqual(self.geom_path.read_text().splitlines()[6:], expected)
+
+    def test_read_geom_cache(self):
+        """Test `read_geom` loads from the cache, which is invalidated on change."""
+        self.write_plain_geom()
+        geom = read_geom(self.geom_path, cache=True)
+        geom_cached = read_geom(self.geom_path, cache=True)
+        self.assertIsInstance(geom_cached['element_material_idx'], np.memmap)
+        self.assertTrue(np.array_equal(
+            geom_cached['element_material_idx'],
+            geom['element_material_idx'],
+        ))
+        self.assertTrue(np.array_equal(
+            geom_cached['material_homog_idx'],
+            geom['material_homog_idx'],
+        ))
+        self.assertEqual(geom_cached['size'], geom['size'])
+
+        # The cache is specific to the `element_material_idx` dtype:
+        geom_int64 = read_geom(self.geom_path, cache=True, dtype=np.int64)
+        self.assertEqual(geom_int64['element_material_idx'].dtype, np.int64)
+        geom_default = read_geom(self.geom_path, cache=True)
+        self.assertEqual(
+            geom_default['element_material_idx'].dtype,
+            geom['element_material_idx'].dtype,
+        )
+
+        # A cache written by an older version is ignored:
+        meta_path = get_geom_cache_dir(self.geom_path).joinpath('geometry.json')
+        cache_meta = json.loads(meta_path.read_text())
+        cache_meta['source']['version'] -= 1
+        meta_path.write_text(json.dumps(cache_meta))
+        self.assertNotIsInstance(
+            read_geom(self.geom_path, cache=True)['element_material_idx'], np.memmap)
+
+        # Modify the file, ensuring the modification time changes:
+        mtime_ns = self.geom_path.stat().st_mtime_ns
+        self.element_material_idx = self.element_material_idx[::-1]
+        self.write_plain_geom()
+        os.utime(self.geom_path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+        geom_new = read_geom(self.geom_path, cache=True)
+        self.assertTrue(np.array_equal(
+            geom_new['element_material_idx'],
+            self.element_material_idx,
+        ))
+
+    def test_read_geom_cache_write_failure(self):
+        """Test a warning is issued if the cache cannot be written."""
+        self.write_plain_geom()
+        get_geom_cache_dir(self.geom_path).write_text('')  # a file, not a directory
+        with self.assertWarnsRegex(UserWarning, 'Could not write'):
+            geom = read_geom(self.geom_path, cache=True)
+        self.assertTrue(np.array_equal(
+            geom['element_material_idx'],
+            self.element_material_idx,
+        ))
+
+    def test_decode_compressed_voxels(self):
+        """Test decoding of the "N of M" and "a to b" compressed syntax."""
+        lines = ['3 of 2', '4 to 2', '1 2 # comment', '', '5 to 6']
+        decoded = decode_geom_voxels(lines, 10)
+        self.assertTrue(np.array_equal(decoded, [2, 2, 2, 4, 3, 2, 1, 2, 5, 6]))
+
+    def test_write_read_compressed_geom(self):
+        """Test a compressed geometry file is read back to the same volume element."""
+        # Runs of repeated material indices ("N of M"), followed by a range ("a to b"):
+        elems = np.concatenate([np.repeat(np.arange(10), 6), np.arange(10, 55)])
+        self.element_material_idx = elems.reshape((7, 5, 3), order='F')
+        write_geom(self.get_volume_element(), self.geom_path, compress=True)
+        geom = read_geom(self.geom_path)
+        self.assertTrue(np.array_equal(
+            geom['element_material_idx'],
+            self.element_material_idx,
+        ))
@@ -0,0 +1,282 @@
+"""`test_hdf5.py`
+
+Tests of the extraction of incremental data from DAMASK HDF5 result files.
+
+"""
+
+from unittest import TestCase
+from pathlib import Path
+import tempfile
+
+import h5py
+import numpy as np
+
+from damask_parse.readers import (
+    read_HDF5_file,
+    read_HDF5_files,
+    read_volume_element_response,
+)
+from damask_parse.writers import write_volume_element_response
+from damask_parse.utils import (
+    add_HDF5_operations_manifest,
+    get_HDF5_operation_key,
+    get_HDF5_operations_manifest,
+    get_HDF5_incremental_quantity,
+    iter_HDF5_incremental_quantity,
+)
+
+DAT_PATH = 'phase/Al/mechanical/P'
+
+
+def write_result_file(path, num_incs=12, num_points=10):
+    """Write a minimal DAMASK-like HDF5 result file, with non-zero-padded increments."""
+    data = np.random.random((num_incs, num_points, 3, 3))
+    with h5py.File(str(path), 'w') as f:
+        for inc_idx in range(num_incs):
+            group = f.create_group(f'inc{inc_idx}')
+            group.attrs['t/s'] = inc_idx * 0.5
+            group[DAT_PATH] = data[inc_idx]
+    return data
+
+
+class HDF5IncrementalQuantityTestCase(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.hdf5_path = Path(self.tmp_dir.name).joinpath('result.hdf5')
+        self.data = write_result_file(self.hdf5_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_increment_stride(self):
+        data = get_HDF5_incremental_quantity(self.hdf5_path, DAT_PATH, increments=5)
+        self.assertTrue(np.array_equal(data, self.data[::5]))
+
+    def test_iter_chunks(self):
+        chunks = list(iter_HDF5_incremental_quantity(
+            self.hdf5_path,
+            DAT_PATH,
+            increments=2,
+            chunk_size=4,
+        ))
+        self.assertEqual([i.shape[0] for i in chunks], [4, 2])
+        self.assertTrue(np.array_equal(np.concatenate(chunks), self.data[::2]))
+
+    def test_iter_orientations(self):
+        """Test orientations are generated as flattened orientation dicts, as they are
+        returned by `get_HDF5_incremental_quantity`."""
+        ori_path = 'phase/Al/mechanical/O'
+        quat_dtype = np.dtype([(i, np.float64) for i in ['w', 'x', 'y', 'z']])
+        with h5py.File(str(self.hdf5_path), 'r+') as f:
+            for inc_idx, inc in enumerate(sorted(f.keys(), key=lambda i: int(i[3:]))):
+                quats = np.zeros(10, dtype=quat_dtype)
+                quats['w'] = inc_idx
+                f[inc][ori_path] = quats
+
+        expected = get_HDF5_incremental_quantity(self.hdf5_path, ori_path)
+        for chunk_size in [None, 5]:
+            chunks = list(iter_HDF5_incremental_quantity(
+                self.hdf5_path,
+                ori_path,
+                chunk_size=chunk_size,
+            ))
+            for i in chunks:
+                self.assertEqual(i['type'], 'quat')
+                self.assertEqual(i['P'], -1)
+            quats = [i['quaternions'] for i in chunks]
+            if chunk_size is None:
+                quats = [i[None] for i in quats]
+            quats = np.concatenate(quats)
+            self.assertEqual(quats.shape, (12, 10, 4))
+            self.assertTrue(np.array_equal(quats, expected['quaternions']))
+
+    def test_transforms_per_increment(self):
+        """Test reductions are identical whether or not they are applied per increment."""
+        transforms = [
+            {'sum_along_axes': [2, 3]},
+            {'mean_along_axes': 1},
+            {'sum_along_axes': 0},
+        ]
+        data = get_HDF5_incremental_quantity(self.hdf5_path, DAT_PATH, transforms)
+        expected = np.sum(np.mean(np.sum(self.data, (2, 3)), 1), 0)
+        self.assertTrue(np.array_equal(data, expected))
+
+    def test_read_HDF5_file_many_quantities(self):
+        incremental_data = [
+            {'name': 'P', 'path': DAT_PATH},
+            {'name': 'P_mean', 'path': DAT_PATH, 'transforms': [{'mean_along_axes': 1}]},
+            {'name': 'P_every_3', 'path': DAT_PATH, 'increments': 3},
+        ]
+        response = read_HDF5_file(self.hdf5_path, incremental_data)
+        self.assertTrue(np.array_equal(response['P']['data'], self.data))
+        self.assertTrue(np.array_equal(
+            response['P_mean']['data'],
+            np.mean(self.data, 1),
+        ))
+        self.assertTrue(np.array_equal(response['P_every_3']['data'], self.data[::3]))
+        self.assertEqual(response['P_every_3']['meta']['increments'], 3)
+
+    def test_read_HDF5_files(self):
+        hdf5_path_2 = Path(self.tmp_dir.name).joinpath('result_2.hdf5')
+        data_2 = write_result_file(hdf5_path_2)
+        missing_path = Path(self.tmp_dir.name).joinpath('missing.hdf5')
+
+        incremental_data = [
+            {'name': 'P_mean', 'path': DAT_PATH, 'transforms': [{'mean_along_axes': 1}]},
+        ]
+        campaign = read_HDF5_files(
+            [self.hdf5_path, missing_path, hdf5_path_2],
+            incremental_data,
+            max_workers=2,
+        )
+        self.assertEqual(campaign['paths'], [str(self.hdf5_path), str(hdf5_path_2)])
+        self.assertEqual(list(campaign['errors'].keys()), [str(missing_path)])
+        self.assertTrue(np.array_equal(
+            campaign['volume_element_response']['P_mean']['data'],
+            np.stack([np.mean(self.data, 1), np.mean(data_2, 1)]),
+        ))
+
+    def test_operations_manifest(self):
+        operation = {'name': 'add_Cauchy', 'args': {'P': 'P'}, 'opts': {}}
+        self.assertEqual(get_HDF5_operations_manifest(self.hdf5_path), [])
+        add_HDF5_operations_manifest(self.hdf5_path, operation)
+        add_HDF5_operations_manifest(self.hdf5_path, operation)
+        self.assertEqual(
+            get_HDF5_operations_manifest(self.hdf5_path),
+            [get_HDF5_operation_key(operation)],
+        )
+
+        # Completed operations are not invoked again (so the `damask` package is not
+        # required here):
+        response = read_HDF5_file(
+            self.hdf5_path,
+            [{'name': 'P', 'path': DAT_PATH}],
+            operations=[operation],
+            cache_operations=True,
+        )
+        self.assertTrue(np.array_equal(response['P']['data'], self.data))
+
+    def test_point_selection(self):
+        mask = np.zeros(10, dtype=bool)
+        mask[[1, 4, 5]] = True
+        selections = [
+            ([7, 2, 2, -1], self.data[:, [7, 2, 2, -1]]),
+            (mask, self.data[:, mask]),
+            (slice(1, 8, 3), self.data[:, 1:8:3]),
+            (slice(None, None, -2), self.data[:, ::-2]),
+            ({'start': 5}, self.data[:, 5:]),
+        ]
+        for points, expected in selections:
+            data = get_HDF5_incremental_quantity(
+                self.hdf5_path,
+                DAT_PATH,
+                transforms=[{'sum_along_axes': 3}],
+                points=points,
+            )
+            self.assertTrue(np.allclose(data, expected.sum(axis=3)))
+
+    def test_point_selection_out_of_range(self):
+        with self.assertRaises(ValueError):
+            get_HDF5_incremental_quantity(self.hdf5_path, DAT_PATH, points=[10])
+
+    def test_increment_selection(self):
+        # Increment times are 0, 0.5, ..., 5.5:
+        selections = [
+            ({'increments': [-1]}, self.data[[-1]]),
+            ({'increments': [3, 0]}, self.data[[3, 0]]),
+            ({'increment_range': [2, 9], 'increments': 3}, self.data[2:9:3]),
+            ({'time_range': [1.0, 2.5]}, self.data[2:6]),
+            ({'time_range': [None, 1.0], 'increments': [-1]}, self.data[[2]]),
+            ({'increment_range': [-4, None], 'time_range': [5.0, None]}, self.data[-2:]),
+        ]
+        for kwargs, expected in selections:
+            data = get_HDF5_incremental_quantity(self.hdf5_path, DAT_PATH, **kwargs)
+            self.assertTrue(np.array_equal(data, expected))
+
+        chunks = list(iter_HDF5_incremental_quantity(
+            self.hdf5_path,
+            DAT_PATH,
+            time_range=[1.0, 2.5],
+            chunk_size=3,
+        ))
+        self.assertTrue(np.array_equal(np.concatenate(chunks), self.data[2:6]))
+
+    def test_increment_selection_out_of_range(self):
+        with self.assertRaises(ValueError):
+            get_HDF5_incremental_quantity(self.hdf5_path, DAT_PATH, increments=[12])
+
+    def test_volume_element_response_small_increments(self):
+        """Test the data of many increments of a small quantity is grouped into chunks
+        that are large enough to compress well."""
+        data = np.cumsum(np.random.normal(size=(5000, 3, 3)), axis=0) * 1e6
+        out_path = Path(self.tmp_dir.name).joinpath('response.hdf5')
+        write_volume_element_response({'P': {'data': data, 'meta': {}}}, out_path)
+
+        with h5py.File(str(out_path), 'r') as f:
+            chunks = f['P/data'].chunks
+            self.assertTrue(np.array_equal(f['P/data'][()], data))
+        self.assertEqual(chunks[1:], (3, 3))
+        self.assertGreaterEqual(np.prod(chunks) * data.itemsize, 2 ** 16)
+        self.assertLess(out_path.stat().st_size, data.nbytes)
+
+    def test_volume_element_response_round_trip(self):
+        response = read_HDF5_file(
+            self.hdf5_path,
+            [
+                {'name': 'P', 'path': DAT_PATH},
+                {'name': 'P_sel', 'path': DAT_PATH, 'points': np.array([2, 0])},
+                {'name': 'P_mean', 'path': DAT_PATH,
+                 'transforms': [{'mean_along_axes': [0, 1, 2, 3]}]},
+            ],
+        )
+        response['O'] = {
+            'data': {'type': 'quat', 'quaternions': np.random.random((12, 10, 4)), 'P': -1},
+            'meta': {'path': 'phase/Al/mechanical/O'},
+        }
+        response['P_all'] = {
+            'data': [self.data, self.data[:2]],
+            'meta': response['P']['meta'],
+        }
+        out_path = Path(self.tmp_dir.name).joinpath('response.hdf5')
+        write_volume_element_response(response, out_path)
+
+        with h5py.File(str(out_path), 'r') as f:
+            # The data of all (small) increments is in one chunk:
+            self.assertEqual(f['P/data'].chunks, (12, 10, 3, 3))
+            self.assertEqual(f['P/data'].compression, 'gzip')
+
+        loaded = read_volume_element_response(out_path)
+        self.assertIsInstance(loaded['P']['data'], h5py.Dataset)
+        self.assertTrue(np.array_equal(loaded['P']['data'][-1], self.data[-1]))
+        self.assertEqual(loaded['P_sel']['meta']['points'], [2, 0])
+        loaded['P']['data'].file.close()
+
+        loaded = read_volume_element_response(out_path, lazy=False)
+        for name in ['P', 'P_sel', 'P_mean']:
+            self.assertTrue(np.array_equal(loaded[name]['data'], response[name]['data']))
+        self.assertEqual(loaded['O']['data']['P'], -1)
+        self.assertTrue(np.array_equal(
+            loaded['O']['data']['quaternions'],
+            response['O']['data']['quaternions'],
+        ))
+        self.assertTrue(np.array_equal(loaded['P_all']['data'][1], self.data[:2]))
+
+    def test_volume_element_response_closed_on_error(self):
+        """Test the file is closed if it cannot be read, even when reading lazily."""
+        out_path = Path(self.tmp_dir.name).joinpath('response.hdf5')
+        with h5py.File(str(out_path), 'w') as f:
+            f['P/data'] = self.data  # missing "meta" attribute
+
+        for lazy in [True, False]:
+            # Keep the traceback (and so the frames that reference the file) alive:
+            error = None
+            try:
+                read_volume_element_response(out_path, lazy=lazy)
+            except KeyError as err:
+                error = err
+            self.assertIsInstance(error, KeyError)
+
+            # Truncating the file would fail if it were still open:
+            with h5py.File(str(out_path), 'w') as f:
+                f['P/data'] = self.data
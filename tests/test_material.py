@@ -0,0 +1,275 @@
+"""`test_material.py`
+
+Tests of the functionality associated with the DAMASK material.yaml file.
+
+"""
+
+from unittest import TestCase
+from pathlib import Path
+import os
+import tempfile
+
+import numpy as np
+import pandas
+from ruamel.yaml import YAML
+
+from damask_parse.readers import read_material
+from damask_parse.writers import write_material
+from damask_parse.utils import (
+    get_material_constituent_idx,
+    get_material_sidecar_path,
+    get_volume_element_materials,
+    validate_volume_element,
+)
+from damask_parse.quats import axang2quat, euler2quat, multiply_quaternions
+
+PHASES = {'Ti': {'lattice': 'hex'}, 'true': {'lattice': 'cubic'}}
+HOMOG_SCHEMES = {'SX': {'N_constituents': 1}}
+
+
+def get_volume_element(num_oris=20, unit_cell_alignment=None):
+    """Get a volume element with hexagonal grains and a cubic "matrix" phase (whose
+    label must be quoted in YAML)."""
+    element_material_idx = np.random.randint(0, num_oris + 1, size=(6, 5, 4))
+    element_material_idx.flat[:num_oris + 1] = np.arange(num_oris + 1)
+    return {
+        'orientations': {
+            'type': 'quat',
+            'quaternions': euler2quat(np.random.random((num_oris, 3)) * np.pi),
+            'unit_cell_alignment': unit_cell_alignment or {'x': 'a'},
+            'P': -1,
+        },
+        'element_material_idx': element_material_idx,
+        'grid_size': np.array(element_material_idx.shape),
+        'phase_labels': ['Ti', 'true'],
+        'homog_label': 'SX',
+    }
+
+
+class MaterialConstituentIdxTestCase(TestCase):
+
+    def test_grouping(self):
+        const_mat_idx = np.array([2, 0, 1, 0, 2, 2, 3])
+        mat_const_idx = get_material_constituent_idx(const_mat_idx)
+        expected = [[1, 3], [2], [0, 4, 5], [6]]
+        self.assertEqual([i.tolist() for i in mat_const_idx], expected)
+
+        const_idx, mat_offsets = get_material_constituent_idx(
+            const_mat_idx, return_csr=True)
+        self.assertEqual(mat_offsets.tolist(), [0, 2, 3, 6, 7])
+        self.assertEqual(
+            [const_idx[i:j].tolist() for i, j in zip(mat_offsets[:-1], mat_offsets[1:])],
+            expected,
+        )
+
+    def test_grouping_not_range(self):
+        for const_mat_idx in [[0, 2], [-1, 0, 1]]:
+            with self.assertRaises(ValueError):
+                get_material_constituent_idx(np.array(const_mat_idx))
+
+    def test_fraction_sums(self):
+        vol_elem = {
+            'orientations': {
+                'type': 'quat',
+                'quaternions': np.tile([1.0, 0, 0, 0], (4, 1)),
+                'unit_cell_alignment': {'x': 'a'},
+            },
+            'constituent_material_idx': np.array([1, 0, 1, 0]),
+            'constituent_material_fraction': np.array([0.5, 0.25, 0.5, 0.75]),
+            'constituent_phase_label': np.array(['Ti'] * 4),
+            'material_homog': np.array(['SX', 'SX']),
+        }
+        validate_volume_element(vol_elem)
+        vol_elem['constituent_material_fraction'][3] = 0.5
+        with self.assertRaisesRegex(ValueError, 'material 0 sum to 0.75'):
+            validate_volume_element(vol_elem)
+
+        # Not checked by structural validation, so must be checked by full validation:
+        vol_elem_valid = validate_volume_element(vol_elem, level='structural')
+        with self.assertRaisesRegex(ValueError, 'material 0 sum to 0.75'):
+            validate_volume_element(vol_elem_valid)
+
+    def test_validated_volume_element(self):
+        vol_elem = validate_volume_element(get_volume_element(), PHASES, HOMOG_SCHEMES)
+        self.assertTrue(vol_elem.is_validated())
+
+        # Validation is skipped, so arrays are shared:
+        vol_elem_2 = validate_volume_element(vol_elem, PHASES, HOMOG_SCHEMES)
+        self.assertIs(vol_elem_2['element_material_idx'], vol_elem['element_material_idx'])
+        self.assertIsNot(vol_elem_2['orientations'], vol_elem['orientations'])
+
+        # Labels are still checked:
+        with self.assertRaisesRegex(ValueError, 'constituent index 20 \\("true"\\)'):
+            validate_volume_element(vol_elem, {'Ti': PHASES['Ti']})
+
+        # Modified volume elements are validated again:
+        vol_elem['constituent_material_idx'][0] = 100
+        self.assertFalse(vol_elem.is_validated())
+        with self.assertRaises(ValueError):
+            validate_volume_element(vol_elem)
+
+
+class CategoricalLabelsTestCase(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        vol_elem = validate_volume_element(get_volume_element())
+        self.vol_elem = dict(vol_elem)
+        self.vol_elem_cat = dict(vol_elem)
+        for key in ['constituent_phase_label', 'material_homog']:
+            # Include an unused label, which need not be defined:
+            self.vol_elem_cat[key] = pandas.Categorical(
+                vol_elem[key],
+                categories=np.unique(vol_elem[key]).tolist() + ['unused'],
+            )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_validate_categorical(self):
+        vol_elem = validate_volume_element(self.vol_elem_cat, PHASES, HOMOG_SCHEMES)
+        self.assertIsInstance(vol_elem['constituent_phase_label'], pandas.Categorical)
+        self.assertEqual(vol_elem.unique_phase_labels.tolist(), ['Ti', 'true'])
+        self.assertEqual(vol_elem.unique_homog_labels.tolist(), ['SX'])
+
+        with self.assertRaisesRegex(ValueError, 'constituent index 20 \\("true"\\)'):
+            validate_volume_element(self.vol_elem_cat, {'Ti': PHASES['Ti']})
+
+        vol_elem_bad = dict(self.vol_elem_cat)
+        vol_elem_bad['material_homog'] = pandas.Categorical.from_codes(
+            [-1] * len(self.vol_elem['material_homog']), categories=['SX'])
+        with self.assertRaisesRegex(ValueError, 'missing values'):
+            validate_volume_element(vol_elem_bad)
+
+    def test_write_read_categorical(self):
+        mat_path = write_material(
+            HOMOG_SCHEMES, PHASES, self.vol_elem, self.tmp_dir.name)
+        mat_str = mat_path.read_text()
+        mat_path = write_material(
+            HOMOG_SCHEMES, PHASES, self.vol_elem_cat, self.tmp_dir.name, sidecar=True)
+        self.assertEqual(mat_path.read_text(), mat_str)
+
+        for use_sidecar in [True, False]:
+            vol_elem = read_material(
+                mat_path, use_sidecar=use_sidecar, categorical=True)['volume_element']
+            for key in ['constituent_phase_label', 'material_homog']:
+                self.assertIsInstance(vol_elem[key], pandas.Categorical)
+                self.assertEqual(
+                    np.asarray(vol_elem[key]).tolist(), self.vol_elem[key].tolist())
+
+
+class MaterialFileTestCase(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_hex_alignment_correction(self):
+        vol_elem = get_volume_element(unit_cell_alignment={'y': 'b'})
+        materials = get_volume_element_materials(vol_elem, HOMOG_SCHEMES, PHASES)
+        hex_quat = axang2quat(np.array([0, 0, 1]), -np.pi/6)
+        for quat, mat in zip(vol_elem['orientations']['quaternions'], materials):
+            self.assertEqual(mat['constituents'][0]['phase'], 'Ti')
+            self.assertTrue(np.allclose(
+                mat['constituents'][0]['orientation'],
+                multiply_quaternions(hex_quat, quat),
+            ))
+        self.assertEqual(materials[-1]['constituents'][0]['phase'], 'true')
+
+    def test_hex_alignment_not_implemented(self):
+        vol_elem = get_volume_element(unit_cell_alignment={'x': 'b'})
+        with self.assertRaises(NotImplementedError):
+            get_volume_element_materials(vol_elem, HOMOG_SCHEMES, PHASES)
+
+    def test_write_material_equivalent_to_materials(self):
+        for alignment in [{'x': 'a'}, {'y': 'b'}]:
+            vol_elem = get_volume_element(unit_cell_alignment=alignment)
+            mat_path = write_material(
+                HOMOG_SCHEMES, PHASES, vol_elem, self.tmp_dir.name)
+            material_dat = YAML(typ='safe').load(Path(mat_path))
+            self.assertEqual(material_dat['phase'], PHASES)
+            self.assertEqual(material_dat['homogenization'], HOMOG_SCHEMES)
+            self.assertEqual(
+                material_dat['microstructure'],
+                get_volume_element_materials(vol_elem, HOMOG_SCHEMES, PHASES),
+            )
+
+    def test_read_material_layouts(self):
+        """Check the same data is parsed from the layout generated by `write_material`,
+        the layout generated by `ruamel.yaml`, and a layout that must be parsed as general
+        YAML (here, with the constituents before the homogenization)."""
+
+        vol_elem = get_volume_element()
+        materials = get_volume_element_materials(vol_elem, HOMOG_SCHEMES, PHASES)
+        mat_path = write_material(HOMOG_SCHEMES, PHASES, vol_elem, self.tmp_dir.name)
+        block_path = Path(self.tmp_dir.name).joinpath('block.yaml')
+        YAML().dump(
+            {'phase': PHASES, 'homogenization': HOMOG_SCHEMES, 'microstructure': materials},
+            block_path,
+        )
+        general_path = Path(self.tmp_dir.name).joinpath('general.yaml')
+        YAML().dump(
+            {
+                'microstructure': [
+                    {'constituents': i['constituents'], 'homogenization': i['homogenization']}
+                    for i in materials
+                ],
+                'phase': PHASES,
+                'homogenization': HOMOG_SCHEMES,
+            },
+            general_path,
+        )
+
+        expected = [
+            [i['homogenization'] for i in materials],
+            [j['phase'] for i in materials for j in i['constituents']],
+            [j['orientation'] for i in materials for j in i['constituents']],
+        ]
+        for path in [mat_path, block_path, general_path]:
+            material_data = read_material(path)
+            self.assertEqual(material_data['phases'], PHASES)
+            self.assertEqual(material_data['homog_schemes'], HOMOG_SCHEMES)
+            vol_elem_read = material_data['volume_element']
+            self.assertEqual(vol_elem_read['material_homog'].tolist(), expected[0])
+            self.assertEqual(vol_elem_read['constituent_phase_label'].tolist(), expected[1])
+            self.assertTrue(np.allclose(
+                vol_elem_read['orientations']['quaternions'][
+                    vol_elem_read['constituent_orientation_idx']],
+                expected[2],
+            ))
+
+    def test_read_material_sidecar(self):
+        vol_elem = get_volume_element(unit_cell_alignment={'y': 'b'})
+        mat_path = write_material(
+            HOMOG_SCHEMES, PHASES, vol_elem, self.tmp_dir.name, sidecar=True)
+        sidecar_path = get_material_sidecar_path(mat_path)
+        self.assertTrue(sidecar_path.exists())
+
+        from_yaml = read_material(mat_path, use_sidecar=False)['volume_element']
+        from_sidecar = read_material(mat_path)['volume_element']
+        for key, val in from_yaml.items():
+            if key == 'orientations':
+                self.assertTrue(np.array_equal(
+                    val['quaternions'], from_sidecar[key]['quaternions']))
+            else:
+                self.assertTrue(np.array_equal(val, from_sidecar[key]))
+                self.assertEqual(val.dtype, from_sidecar[key].dtype)
+
+        # Writing the material file without a sidecar removes any existing sidecar:
+        sidecar_bytes = sidecar_path.read_bytes()
+        vol_elem_new = get_volume_element()
+        write_material(HOMOG_SCHEMES, PHASES, vol_elem_new, self.tmp_dir.name)
+        self.assertFalse(sidecar_path.exists())
+
+        # A sidecar that is older than the material file is ignored:
+        sidecar_path.write_bytes(sidecar_bytes)
+        mat_mtime = mat_path.stat().st_mtime_ns
+        os.utime(sidecar_path, ns=(mat_mtime - 10 ** 9, mat_mtime - 10 ** 9))
+        self.assertTrue(np.allclose(
+            read_material(mat_path)['volume_element']['orientations']['quaternions'],
+            [j['orientation']
+             for i in get_volume_element_materials(vol_elem_new, HOMOG_SCHEMES, PHASES)
+             for j in i['constituents']],
+        ))
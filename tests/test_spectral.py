@@ -6,10 +6,50 @@ Tests `read_spectral_stdout` and `read_spectral_stderr`.
 
 from unittest import TestCase
 from pathlib import Path
+import asyncio
+import tempfile
 
+import h5py
 import numpy as np
 
-from damask_parse.readers import parse_increment, parse_increment_iteration
+from damask_parse.readers import (
+    parse_increment,
+    parse_increment_iteration,
+    read_spectral_stdout,
+    read_spectral_files,
+    SpectralStdoutMonitor,
+)
+
+INC_TEMPLATE = """
+ Time {time:.5E}s: Increment {inc}/500-1/1 of load case 1/1
+ Increment {inc}/500-1/1 @ Iteration 001≤000≤250
+
+ deformation gradient aim       =
+ 1.0000000    0.0000000    0.0000000
+ 0.0000000    1.0000000    0.0000000
+ 0.0000000    0.0000000    {dg_33:.7f}
+
+ Piola--Kirchhoff stress       / MPa =
+     23.6511        -0.0171        -0.0231
+     -0.0171        23.5818         0.0283
+     -0.0231         0.0284        44.2691
+
+ error divergence =       676.79 (1.50E+07 / m, tol =  2.21E+04)
+ error stress BC  =        53.43 (2.37E+07 Pa,  tol =  4.43E+05)
+
+ ===========================================================================
+
+ increment {inc} converged
+"""
+
+
+def write_spectral_stdout(path, num_incs):
+    """Write a minimal spectral solver standard output file."""
+    with Path(path).open('w', encoding='utf8') as handle:
+        handle.write(' DAMASK spectral solver\n')
+        for inc in range(1, num_incs + 1):
+            handle.write(' ' + '#' * 75 + '\n')
+            handle.write(INC_TEMPLATE.format(time=inc, inc=inc, dg_33=1 + inc * 1e-3))
 
 
 class SpectralStdOutTestCase(TestCase):
@@ -433,3 +473,132 @@ class SpectralStdOutTestCase(TestCase):
         self.assertTrue(np.isclose(out['error_stress_BC']['value'], 2.37e7))
         self.assertTrue(np.isclose(out['error_stress_BC']['tol'], 4.43e5))
         self.assertTrue(np.isclose(out['error_stress_BC']['relative'], 53.43))
+
+
+class SpectralStdOutFileTestCase(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.stdout_path = Path(self.tmp_dir.name).joinpath('stdout.log')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_spectral_stdout(self):
+
+        write_spectral_stdout(self.stdout_path, num_incs=4)
+        out = read_spectral_stdout(self.stdout_path)
+
+        self.assertEqual(out['deformation_gradient_aim'].shape, (4, 3, 3))
+        self.assertTrue(np.allclose(
+            out['deformation_gradient_aim'][:, 2, 2],
+            [1.001, 1.002, 1.003, 1.004],
+        ))
+        self.assertTrue(np.array_equal(out['increment_idx'], [0, 1, 2, 3]))
+        self.assertTrue(np.array_equal(out['inc_number'], [1, 2, 3, 4]))
+        self.assertTrue(np.allclose(out['error_stress_BC']['tol'], 4.43e5))
+
+    def test_monitor_poll(self):
+
+        write_spectral_stdout(self.stdout_path, num_incs=3)
+        monitor = SpectralStdoutMonitor(self.stdout_path)
+
+        # The last increment is not complete until the next delimiter is written:
+        out = monitor.poll()
+        self.assertTrue(np.array_equal(out['inc_number'], [1, 2]))
+
+        out = monitor.poll()
+        self.assertEqual(out['inc_number'].size, 0)
+
+        with self.stdout_path.open('a', encoding='utf8') as handle:
+            handle.write(' ' + '#' * 75 + '\n')
+            handle.write(INC_TEMPLATE.format(time=4, inc=4, dg_33=1.004)[:50])
+
+        out = monitor.poll()
+        self.assertTrue(np.array_equal(out['inc_number'], [3]))
+        self.assertTrue(np.array_equal(out['increment_idx'], [2]))
+
+        with self.stdout_path.open('a', encoding='utf8') as handle:
+            handle.write(INC_TEMPLATE.format(time=4, inc=4, dg_33=1.004)[50:])
+
+        out = monitor.poll(final=True)
+        self.assertTrue(np.array_equal(out['inc_number'], [4]))
+        self.assertTrue(np.allclose(out['deformation_gradient_aim'][:, 2, 2], [1.004]))
+
+    def test_monitor_follow(self):
+
+        write_spectral_stdout(self.stdout_path, num_incs=3)
+
+        async def collect(monitor, **kwargs):
+            return [out['inc_number'].tolist()
+                    async for out in monitor.follow(interval=0.01, **kwargs)]
+
+        # The last increment is generated once the solver has finished:
+        is_finished = iter([False, True]).__next__
+        incs = asyncio.run(collect(
+            SpectralStdoutMonitor(self.stdout_path), is_finished=is_finished))
+        self.assertEqual(incs, [[1, 2], [3]])
+
+        incs = asyncio.run(collect(
+            SpectralStdoutMonitor(self.stdout_path), idle_timeout=0.05))
+        self.assertEqual(incs, [[1, 2], [3]])
+
+    def test_monitor_truncated_file(self):
+
+        write_spectral_stdout(self.stdout_path, num_incs=3)
+        monitor = SpectralStdoutMonitor(self.stdout_path)
+        monitor.poll(final=True)
+        write_spectral_stdout(self.stdout_path, num_incs=2)
+        out = monitor.poll(final=True)
+        self.assertTrue(np.array_equal(out['inc_number'], [1, 2]))
+        self.assertTrue(np.array_equal(out['increment_idx'], [0, 1]))
+
+    def test_read_spectral_files(self):
+
+        write_spectral_stdout(self.stdout_path, num_incs=2)
+        missing_path = Path(self.tmp_dir.name).joinpath('missing.log')
+        paths = [self.stdout_path, missing_path]
+        results = read_spectral_files(paths, max_workers=2)
+
+        self.assertEqual(list(results.keys()), [str(i) for i in paths])
+        self.assertIsNone(results[str(self.stdout_path)]['error'])
+        self.assertTrue(np.array_equal(
+            results[str(self.stdout_path)]['data']['inc_number'],
+            [1, 2],
+        ))
+        self.assertIsNone(results[str(missing_path)]['data'])
+        self.assertIn('FileNotFoundError', results[str(missing_path)]['error'])
+
+    def test_read_spectral_files_consolidated(self):
+
+        write_spectral_stdout(self.stdout_path, num_incs=2)
+        missing_path = Path(self.tmp_dir.name).joinpath('missing.log')
+        h5_path = Path(self.tmp_dir.name).joinpath('results.hdf5')
+        results = read_spectral_files(
+            [self.stdout_path, missing_path],
+            max_workers=1,
+            consolidated_path=h5_path,
+        )
+        data = results[str(self.stdout_path)]['data']
+
+        with h5py.File(h5_path, 'r') as f:
+            self.assertEqual(list(f.keys()), ['0', '1'])
+
+            group = f['0']
+            self.assertEqual(group.attrs['path'], str(self.stdout_path))
+            self.assertNotIn('error', group.attrs)
+            self.assertTrue(np.array_equal(group['inc_number'][()], data['inc_number']))
+            self.assertTrue(np.allclose(
+                group['deformation_gradient_aim'][()],
+                data['deformation_gradient_aim'],
+            ))
+            self.assertTrue(np.allclose(
+                group['error_stress_BC']['tol'][()],
+                data['error_stress_BC']['tol'],
+            ))
+            self.assertEqual(group['warnings']['code'].shape, (0,))
+
+            group = f['1']
+            self.assertEqual(group.attrs['path'], str(missing_path))
+            self.assertIn('FileNotFoundError', group.attrs['error'])
+            self.assertEqual(list(group.keys()), [])
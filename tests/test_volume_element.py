@@ -0,0 +1,170 @@
+"""`test_volume_element.py`
+
+Tests of the `VolumeElement` class and volume element utilities.
+
+"""
+
+from unittest import TestCase
+from pathlib import Path
+import tempfile
+
+import numpy as np
+import pandas
+
+from damask_parse.readers import read_geom
+from damask_parse.writers import write_geom, write_material
+from damask_parse.utils import (
+    VolumeElement,
+    add_volume_element_buffer_zones,
+    get_element_material_idx_dtype,
+    validate_volume_element,
+)
+from test_material import get_volume_element, PHASES, HOMOG_SCHEMES
+
+
+class VolumeElementClassTestCase(TestCase):
+
+    def setUp(self):
+        self.vol_elem = get_volume_element()
+
+    def test_dict_round_trip(self):
+        vol_elem_valid = validate_volume_element(self.vol_elem)
+        vol_elem_obj = VolumeElement.from_dict(self.vol_elem)
+        self.assertEqual(vol_elem_obj.phase_labels, ['Ti', 'true'])
+        self.assertEqual(vol_elem_obj.constituent_material_idx.dtype, np.int32)
+        self.assertEqual(vol_elem_obj.constituent_phase_code.dtype, np.int32)
+
+        vol_elem_dict = vol_elem_obj.to_dict()
+        self.assertEqual(set(vol_elem_dict), set(vol_elem_valid))
+        for key, val in vol_elem_valid.items():
+            if key == 'orientations':
+                self.assertTrue(np.array_equal(
+                    val['quaternions'], vol_elem_dict[key]['quaternions']))
+            else:
+                self.assertTrue(np.array_equal(val, vol_elem_dict[key]))
+
+        # Views of the arrays of the object are passed to validation:
+        vol_elem_dict = validate_volume_element(vol_elem_obj)
+        self.assertTrue(np.shares_memory(
+            vol_elem_dict['constituent_material_idx'],
+            vol_elem_obj.constituent_material_idx,
+        ))
+
+        # Labels are passed to validation as codes and label tables:
+        self.assertIsInstance(vol_elem_dict['constituent_phase_label'], pandas.Categorical)
+        vol_elem_obj_2 = VolumeElement.from_dict(vol_elem_obj.to_dict(categorical=True))
+        self.assertTrue(np.array_equal(
+            vol_elem_obj_2.constituent_phase_label, vol_elem_obj.constituent_phase_label))
+
+    def test_invalid_volume_element(self):
+        emi = self.vol_elem['element_material_idx']
+        with self.assertRaises(ValueError):
+            VolumeElement({'x': 'a'}, size='bogus')
+        with self.assertRaises(ValueError):
+            VolumeElement({'x': 'a'}, origin=[0, 0])
+        with self.assertRaises(TypeError):
+            VolumeElement({'x': 'a'}, element_material_idx=emi.astype(float))
+        with self.assertRaises(ValueError):
+            VolumeElement({'x': 'a'}, element_material_idx=emi - 1)
+
+        # A volume element without materials:
+        vol_elem = VolumeElement({'x': 'a'}, element_material_idx=emi)
+        with self.assertRaisesRegex(ValueError, 'no materials'):
+            validate_volume_element(vol_elem)
+
+        # A volume element with too few materials for `element_material_idx`:
+        ori_idx = vol_elem.add_orientations([[1, 0, 0, 0]])
+        vol_elem.add_material('SX', 'Ti', ori_idx)
+        with self.assertRaisesRegex(ValueError, 'does not index into the 1 materials'):
+            validate_volume_element(vol_elem)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(ValueError):
+                write_geom(vol_elem, Path(tmp_dir).joinpath('geom.geom'))
+
+    def test_read_only_arrays(self):
+        """Test the arrays of a `VolumeElement` cannot be modified without being checked,
+        so that its volume element dict may skip validation."""
+        vol_elem = VolumeElement.from_dict(self.vol_elem)
+        with self.assertRaises(ValueError):
+            vol_elem.quaternions[0] = [5, 5, 5, 5]
+        with self.assertRaises(ValueError):
+            vol_elem.to_dict()['constituent_material_fraction'][0] = 2
+        with self.assertRaises(ValueError):
+            vol_elem.element_material_idx[0, 0, 0] = -1
+
+        # The array from which `element_material_idx` was set is checked again:
+        emi = self.vol_elem['element_material_idx'].copy()
+        vol_elem.element_material_idx = emi
+        emi[0, 0, 0] = -1
+        with self.assertRaises(ValueError):
+            vol_elem.to_dict()
+
+    def test_add_material(self):
+        vol_elem = VolumeElement.from_dict(self.vol_elem)
+        num_mats = vol_elem.num_materials
+        ori_idx = vol_elem.add_orientations([[1, 0, 0, 0], [0, 1, 0, 0]])
+        for _ in range(100):
+            mat_idx = vol_elem.add_material('SX', ['true', 'Ti'], ori_idx, [0.25, 0.75])
+        self.assertEqual(mat_idx, num_mats + 99)
+        self.assertEqual(vol_elem.constituent_phase_label[-2:].tolist(), ['true', 'Ti'])
+        self.assertEqual(vol_elem.constituent_material_idx[-1], mat_idx)
+        vol_elem.add_material('SX', 'Al', ori_idx[:1])
+        self.assertEqual(vol_elem.phase_labels, ['Ti', 'true', 'Al'])
+
+        with self.assertRaises(ValueError):
+            vol_elem.add_material('SX', 'Ti', ori_idx, [0.5, 0.6])
+        with self.assertRaises(ValueError):
+            vol_elem.add_material('SX', 'Ti', [vol_elem.num_orientations])
+
+        phases = {**PHASES, 'Al': {'lattice': 'cubic'}}
+        validate_volume_element(dict(vol_elem.to_dict()), phases, HOMOG_SCHEMES)
+
+    def test_add_buffer_zones(self):
+        # No buffer on the -y face:
+        buffer_sizes = [2, 1, 0, 3, 1, 0]
+        for vol_elem in [self.vol_elem, VolumeElement.from_dict(self.vol_elem)]:
+            vol_elem_buff = add_volume_element_buffer_zones(
+                vol_elem, buffer_sizes, [1, 2, 1, 1, 2, 1], ['Al', 'Cu'], 'SX')
+            if isinstance(vol_elem, VolumeElement):
+                vol_elem_buff = vol_elem_buff.to_dict()
+            emi = vol_elem_buff['element_material_idx']
+            self.assertEqual(emi.shape, (9, 8, 5))
+            self.assertTrue(np.array_equal(
+                emi[2:-1, :5, 1:], self.vol_elem['element_material_idx']))
+            self.assertEqual(
+                vol_elem_buff['constituent_phase_label'][np.unique(emi[:2, 0, 1])].tolist(),
+                ['Al'],
+            )
+
+    def test_element_material_idx_dtype(self):
+        self.assertEqual(get_element_material_idx_dtype(127), np.int8)
+        self.assertEqual(get_element_material_idx_dtype(128), np.int16)
+        self.assertEqual(get_element_material_idx_dtype(10, np.int64), np.int64)
+        with self.assertRaises(TypeError):
+            get_element_material_idx_dtype(10, float)
+
+        # The dtype is widened as buffer materials are added:
+        vol_elem = VolumeElement.from_dict(self.vol_elem)
+        ori_idx = vol_elem.add_orientations([[1, 0, 0, 0]])
+        while vol_elem.num_materials < 127:
+            vol_elem.add_material('SX', 'Ti', ori_idx)
+        vol_elem.element_material_idx = vol_elem.element_material_idx.astype(np.int8)
+        vol_elem_buff = add_volume_element_buffer_zones(
+            vol_elem, [1, 0, 0, 0, 0, 0], [1] * 6, ['Al'], 'SX')
+        emi = vol_elem_buff.element_material_idx
+        self.assertEqual(emi.dtype, np.int16)
+        self.assertEqual(emi.max(), 127)
+        emi = add_volume_element_buffer_zones(
+            vol_elem, [1, 0, 0, 0, 0, 0], [1] * 6, ['Al'], 'SX', dtype=np.int64,
+        ).element_material_idx
+        self.assertEqual(emi.dtype, np.int64)
+
+    def test_writers_accept_volume_element(self):
+        vol_elem = VolumeElement.from_dict(self.vol_elem)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            geom_path = write_geom(vol_elem, f'{tmp_dir}/geom.geom')
+            self.assertTrue(np.array_equal(
+                read_geom(geom_path)['element_material_idx'],
+                self.vol_elem['element_material_idx'],
+            ))
+            write_material(HOMOG_SCHEMES, PHASES, vol_elem, tmp_dir)